@@ -0,0 +1,96 @@
+"""
+JSON serialization benchmark: stdlib json (Flask default) vs json_provider
+
+Builds synthetic news snapshots shaped like process_rss_feed_enhanced() output
+and the build_gainers_losers() result, then times dumps/loads for each size
+(sector_data is capped at 10 entries per list, so it plateaus in size).
+
+    python benchmarks/bench_json.py
+"""
+import json
+import os
+import random
+import string
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from stock_news import json_provider  # noqa: E402
+
+SECTORS = ['Banking', 'IT', 'Oil & Gas', 'Pharma', 'Auto', 'Defense', 'Metals', 'FMCG',
+           'Real Estate', 'Cement', 'Telecom', 'Power', 'Retail', 'Financial Services']
+SYMBOLS = ['RELIANCE', 'TCS', 'HDFCBANK', 'INFY', 'ICICIBANK', 'SBIN', 'BEL', 'HAL', 'ITC',
+           'LT', 'MARUTI', 'SUNPHARMA', 'TATASTEEL', 'NTPC', 'BHARTIARTL', 'TITAN']
+
+
+def words(n):
+    return ' '.join(''.join(random.choices(string.ascii_lowercase, k=random.randint(3, 9)))
+                    for _ in range(n))
+
+
+def make_article(i):
+    description = words(50)
+    return {
+        'id': f'{i:012x}',
+        'title': words(12).capitalize(),
+        'description': description,
+        'url': f'https://example.com/markets/stocks/news/{i}.cms',
+        'sentiment': round(random.uniform(0.5, 0.9), 2),
+        'sentiment_label': random.choice(['Positive', 'Negative', 'Neutral']),
+        'source': 'Economic Times Market',
+        'stock_mentions': random.sample(SYMBOLS, random.randint(1, 3)),
+        'summary': description[:150],
+        'published_date': '2025-01-15 09:30',
+    }
+
+
+def make_snapshot(n_articles):
+    sector_articles = {sector: [] for sector in SECTORS}
+    for i in range(n_articles):
+        sector_articles[SECTORS[i % len(SECTORS)]].append(make_article(i))
+
+    sector_data = {}
+    for sector, articles in sector_articles.items():
+        sector_data[sector] = {
+            'gainers': [{'symbol': s, 'positive_count': 3, 'articles': articles[:3]} for s in SYMBOLS[:10]],
+            'losers': [{'symbol': s, 'negative_count': 2, 'articles': articles[:3]} for s in SYMBOLS[6:16]],
+            'positive': articles[:10],
+            'negative': articles[:10],
+        }
+    return sector_articles, sector_data
+
+
+def flask_stdlib_dumps(obj):
+    # DefaultJSONProvider with compact output
+    return json.dumps(obj, ensure_ascii=True, sort_keys=True, separators=(',', ':'))
+
+
+def bench(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    return f"{label:<24} {seconds * 1000:9.3f} ms"
+
+
+def main():
+    random.seed(42)
+    print(f"json_provider backend: {json_provider.BACKEND}\n")
+
+    for n_articles in (30, 300, 3000):
+        sector_articles, sector_data = make_snapshot(n_articles)
+
+        for name, payload in (('sector_articles', sector_articles), ('sector_data', sector_data)):
+            encoded = flask_stdlib_dumps(payload)
+            number = max(1, 300000 // len(encoded))
+
+            print(f"--- {name}, {n_articles} articles: {len(encoded) / 1024:.0f} KB compact, "
+                  f"{len(json.dumps(payload, indent=2)) / 1024:.0f} KB indent=2 ---")
+            print(bench('stdlib dumps', lambda: flask_stdlib_dumps(payload), number))
+            print(bench('stdlib dumps indent=2', lambda: json.dumps(payload, indent=2), number))
+            print(bench(f'{json_provider.BACKEND} dumps', lambda: json_provider.dumps_bytes(payload), number))
+            print(bench('stdlib loads', lambda: json.loads(encoded), number))
+            print(bench(f'{json_provider.BACKEND} loads', lambda: json_provider.loads(encoded), number))
+            print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Login throughput: verify_user() calls per second, total and per core
+
+Runs against a throwaway user store in a temp directory. Each method is
+measured with the hashing pool and inline (hashing on the calling threads),
+with THREADS concurrent logins standing in for waitress threads.
+
+    python benchmarks/bench_login.py
+    python benchmarks/bench_login.py --methods scrypt:16384:8:1 scrypt:32768:8:1 --seconds 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+THREADS = 8
+USERS = 20
+
+
+def measure(users, seconds, threads):
+    done = []
+    deadline = time.perf_counter() + seconds
+
+    def worker(n):
+        count = 0
+        while time.perf_counter() < deadline:
+            ok, _ = users.verify_user(f'bench{(n + count) % USERS}', 'correct horse')
+            assert ok
+            count += 1
+        done.append(count)
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return sum(done) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--methods', nargs='+', default=['scrypt:32768:8:1'])
+    parser.add_argument('--seconds', type=float, default=3.0)
+    parser.add_argument('--threads', type=int, default=THREADS)
+    args = parser.parse_args()
+
+    from stock_news import passwords, users     # imported before chdir: company data is read from cwd
+    os.chdir(tempfile.mkdtemp())
+    os.makedirs('user_data/watchlists')
+
+    cores = os.cpu_count() or 1
+    print(f"{cores} cores, {args.threads} login threads, {args.seconds:.0f}s per run\n")
+    print(f"{'method':<24} {'mode':<8} {'logins/s':>9} {'per core':>9}")
+    for method in args.methods:
+        for mode in ('pool', 'inline'):
+            passwords.configure(method)
+            if mode == 'inline':
+                passwords.hasher['inline'] = True
+            with users.transaction(users.get_connection()) as conn:
+                conn.execute('DELETE FROM users')
+            for n in range(USERS):
+                users.create_user(f'bench{n}', 'correct horse', 'bench@example.com')
+
+            rate = measure(users, args.seconds, args.threads)
+            print(f"{method:<24} {mode:<8} {rate:>9.1f} {rate / cores:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
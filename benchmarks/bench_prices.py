@@ -0,0 +1,93 @@
+"""
+Watchlist quote lookups: upstream provider calls and request latency
+
+THREADS concurrent users keep loading watchlists of SYMBOLS stocks (drawn
+from a shared pool of POOL symbols) for a few seconds against a provider
+that takes --latency seconds per call. Compares the old per-stock loop (one
+provider call per symbol, no cache) with the shared QuoteCache at --ttl.
+
+    python benchmarks/bench_prices.py
+    python benchmarks/bench_prices.py --threads 32 --latency 0.1 --ttl 1
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from stock_news.companies import VALID_INDIAN_SYMBOLS  # noqa: E402
+from stock_news.prices import DemoProvider, QuoteCache  # noqa: E402
+
+SYMBOLS = 100
+POOL = 150
+
+
+class SlowProvider(DemoProvider):
+    """Demo quotes after a fixed delay per call, counting calls"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def get_quotes(self, symbols):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return super().get_quotes(symbols)
+
+
+def run(lookup, watchlists, seconds):
+    samples = []
+    deadline = time.perf_counter() + seconds
+
+    def worker(watchlist):
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            lookup(watchlist)
+            samples.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=worker, args=(watchlist,)) for watchlist in watchlists]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    samples.sort()
+    return len(samples), samples[len(samples) // 2] * 1000, samples[int(len(samples) * 0.99)] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds per provider call')
+    parser.add_argument('--ttl', type=float, default=1.0, help='quote cache window (seconds)')
+    parser.add_argument('--seconds', type=float, default=3.0)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    pool = rng.sample(sorted(VALID_INDIAN_SYMBOLS), min(POOL, len(VALID_INDIAN_SYMBOLS)))
+    watchlists = [rng.sample(pool, min(SYMBOLS, len(pool))) for _ in range(args.threads)]
+    windows = args.seconds / args.ttl
+
+    print(f"{args.threads} users x {SYMBOLS} stocks, provider {args.latency * 1000:.0f}ms/call, "
+          f"ttl {args.ttl}s, {args.seconds:.0f}s\n")
+    print(f"{'mode':<10} {'requests':>9} {'calls':>7} {'calls/window':>13} {'p50 ms':>8} {'p99 ms':>8}")
+
+    provider = SlowProvider(args.latency)
+    requests, p50, p99 = run(lambda watchlist: [provider.get_quotes([symbol]) for symbol in watchlist],
+                             watchlists, args.seconds)
+    print(f"{'per-stock':<10} {requests:>9} {provider.calls:>7} {provider.calls / windows:>13.1f} "
+          f"{p50:>8.1f} {p99:>8.1f}")
+
+    provider = SlowProvider(args.latency)
+    cache = QuoteCache(provider, ttl=args.ttl)
+    requests, p50, p99 = run(cache.get_quotes, watchlists, args.seconds)
+    print(f"{'cached':<10} {requests:>9} {provider.calls:>7} {provider.calls / windows:>13.1f} "
+          f"{p50:>8.1f} {p99:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
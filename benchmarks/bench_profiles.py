@@ -0,0 +1,103 @@
+"""
+Side-by-side comparison of the engine profiles
+
+Each profile runs in a fresh interpreter: create_app() time, /summarize backend
+time per article, and /api/dashboard + /api/sector_pane latency against a
+synthetic snapshot (no network; feed fetching is replaced).
+
+    python benchmarks/bench_profiles.py
+    python benchmarks/bench_profiles.py lite production
+"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+CHILD = r'''
+import json, os, random, sys, tempfile, time
+sys.path.insert(0, os.getcwd())
+random.seed(42)
+
+started = time.perf_counter()
+import stock_news
+from stock_news import config, feed_scheduler, snapshot, summarizers
+from stock_news.companies import COMPANY_RECORDS
+app = stock_news.create_app(PROFILE)
+create_ms = (time.perf_counter() - started) * 1000
+
+# Keep the benchmark's snapshot out of the real user_data/
+if isinstance(snapshot.snapshot_store['backend'], snapshot.FileSnapshotStore):
+    snapshot.snapshot_store['backend'].path = os.path.join(tempfile.mkdtemp(), 'news_snapshot.json')
+
+def fake_feeds(feeds):
+    results = {}
+    for n, name in enumerate(feeds):
+        sector_articles = {}
+        for i in range(n * 8, n * 8 + 8):
+            record = random.choice(COMPANY_RECORDS)
+            sector_articles.setdefault(record['SECTOR'], []).append({
+                'id': f'{i:012x}', 'title': f"{record['COMPANY_NAME']} shares rally", 'description': 'profit growth',
+                'url': f'https://example.com/{i}', 'sentiment': 0.8,
+                'sentiment_label': random.choice(['Positive', 'Negative']), 'source': 'Bench',
+                'stock_mentions': [record['SYMBOL'].upper()], 'summary': 'profit growth',
+                'published_date': '2025-01-15 09:30'})
+        results[name] = (sector_articles, {'seconds': 0.0, 'error': None, 'links': []})
+    return results
+
+feed_scheduler.fetch_feeds = fake_feeds
+started = time.perf_counter()
+stock_news.warmup(app)
+warmup_ms = (time.perf_counter() - started) * 1000
+
+text = ' '.join(f"Sentence {i} says Reliance reported revenue growth of {i} percent in the quarter." for i in range(200))
+summarize = summarizers.SUMMARIZERS[config.settings['summarizer']]
+started = time.perf_counter()
+for _ in range(20):
+    summarize(text[:config.settings['max_article_chars'] or len(text)], max_sentences=3)
+summarize_ms = (time.perf_counter() - started) * 1000 / 20
+
+client = app.test_client()
+with client.session_transaction() as s:
+    s['user_id'] = 'bench-user'
+sector = next(iter(snapshot.news_cache['sector_data']))
+timings = {}
+for path in ('/api/dashboard', f'/api/sector_pane?sector={sector}'):
+    samples = []
+    for _ in range(200):
+        started = time.perf_counter()
+        client.get(path, headers={'Accept-Encoding': 'gzip'})
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    timings[path.split('?')[0]] = samples[len(samples) // 2]
+
+print(json.dumps({'create_ms': create_ms, 'warmup_ms': warmup_ms, 'summarize_ms': summarize_ms,
+                  'feeds': len(config.settings['feeds']), 'summarizer': config.settings['summarizer'],
+                  'cache': config.settings['cache_backend'], 'routes_p50_ms': timings}))
+'''
+
+
+def run_profile(profile):
+    code = f"PROFILE = {profile!r}\n" + CHILD
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    sys.path.insert(0, ROOT)
+    from stock_news.config import PROFILES
+
+    profiles = sys.argv[1:] or list(PROFILES)
+    print(f"{'profile':<12}{'feeds':>6}  {'summarizer':<13}{'cache':<8}{'create':>9}{'warmup':>9}"
+          f"{'summary':>9}{'dashboard':>11}{'pane':>8}   (ms)")
+    for profile in profiles:
+        r = run_profile(profile)
+        routes = r['routes_p50_ms']
+        print(f"{profile:<12}{r['feeds']:>6}  {r['summarizer']:<13}{r['cache']:<8}{r['create_ms']:>9.1f}"
+              f"{r['warmup_ms']:>9.1f}{r['summarize_ms']:>9.2f}{routes['/api/dashboard']:>11.2f}"
+              f"{routes['/api/sector_pane']:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
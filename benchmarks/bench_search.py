@@ -0,0 +1,118 @@
+"""
+/api/search_stocks latency: search index over the real company list and over
+a synthetic 10k+ symbol universe
+
+Queries are every 2-4 character prefix of real symbols plus substrings of
+company names (what autocomplete sends per keystroke); reports p50/p99/max.
+The fuzzy rows search for every symbol and name in the universe with one or
+two typos and also report how often the intended company comes back.
+
+    python benchmarks/bench_search.py
+    python benchmarks/bench_search.py --universe 50000
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from stock_news.companies import COMPANY_RECORDS  # noqa: E402
+from stock_news.search import SearchIndex  # noqa: E402
+
+
+def synthetic_records(count, seed=11):
+    """COMPANY_RECORDS padded with made-up companies built from real name words"""
+    rng = random.Random(seed)
+    words = sorted({word for record in COMPANY_RECORDS for word in record['COMPANY_NAME'].split()})
+    sectors = sorted({record['SECTOR'] for record in COMPANY_RECORDS})
+    records = list(COMPANY_RECORDS)
+    symbols = {record['SYMBOL'] for record in records}
+    while len(records) < count:
+        symbol = ''.join(rng.choices(string.ascii_uppercase, k=rng.randint(3, 10)))
+        if symbol in symbols:
+            continue
+        symbols.add(symbol)
+        records.append({'SYMBOL': symbol, 'COMPANY_NAME': ' '.join(rng.sample(words, rng.randint(2, 4))),
+                        'SECTOR': rng.choice(sectors)})
+    return records
+
+
+def queries_for(records, count, seed=5):
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        record = rng.choice(records)
+        if rng.random() < 0.6:
+            queries.append(record['SYMBOL'][:rng.randint(2, 4)].lower())
+        else:
+            name = record['COMPANY_NAME'].lower()
+            start = rng.randint(0, max(0, len(name) - 3))
+            queries.append(name[start:start + rng.randint(3, 8)])
+    return queries
+
+
+def typo(text, rng, count):
+    """text with count random edits: swap, drop, double or replace a letter"""
+    for _ in range(count):
+        if len(text) < 3:
+            break
+        i = rng.randrange(1, len(text) - 1)
+        kind = rng.randrange(4)
+        if kind == 0:
+            text = text[:i] + text[i + 1] + text[i] + text[i + 2:]
+        elif kind == 1:
+            text = text[:i] + text[i + 1:]
+        elif kind == 2:
+            text = text[:i] + text[i] + text[i:]
+        else:
+            text = text[:i] + rng.choice(string.ascii_lowercase) + text[i + 1:]
+    return text
+
+
+def typo_queries(records, seed=7):
+    """(query, intended symbol) for every symbol and name, misspelled"""
+    rng = random.Random(seed)
+    queries = []
+    for record in records:
+        for text in (record['SYMBOL'], record['COMPANY_NAME']):
+            text = text.lower()
+            queries.append((typo(text, rng, 1 if len(text) <= 8 else 2), record['SYMBOL']))
+    return queries
+
+
+def measure(search, queries):
+    samples = []
+    for query in queries:
+        started = time.perf_counter()
+        search(query)
+        samples.append((time.perf_counter() - started) * 1e6)
+    samples.sort()
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.99)], samples[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--universe', type=int, default=10000)
+    parser.add_argument('--queries', type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'universe':<12} {'build ms':>9} {'p50 us':>8} {'p99 us':>8} {'max us':>8}")
+    for label, records in (('company.csv', COMPANY_RECORDS), (f'{args.universe}', synthetic_records(args.universe))):
+        started = time.perf_counter()
+        index = SearchIndex(records)
+        build_ms = (time.perf_counter() - started) * 1000
+        p50, p99, worst = measure(index.search, queries_for(records, args.queries))
+        print(f"{label:<12} {build_ms:>9.1f} {p50:>8.1f} {p99:>8.1f} {worst:>8.1f}")
+
+        typos = typo_queries(records)
+        p50, p99, worst = measure(index.search, [query for query, _ in typos])
+        found = sum(any(result['symbol'] == symbol for result in index.search(query)) for query, symbol in typos)
+        print(f"{label + ' fuzzy':<12} {'':>9} {p50:>8.1f} {p99:>8.1f} {worst:>8.1f}"
+              f"   {len(typos)} misspellings, {100 * found / len(typos):.0f}% found")
+
+
+if __name__ == '__main__':
+    main()
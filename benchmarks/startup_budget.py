@@ -0,0 +1,121 @@
+"""
+Startup-time budget for the web app
+
+Builds the app (`import app; app.create()`) in fresh interpreters, reports the
+slowest imports from `python -X importtime`, and with --check exits non-zero
+when startup time, baseline RSS or the set of eagerly imported heavy modules
+exceeds the budget.
+
+    python benchmarks/startup_budget.py           # report
+    python benchmarks/startup_budget.py --check   # fail on regression
+
+tests/test_startup_budget.py runs the same check under pytest.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+IMPORT_BUDGET_MS = 1000
+RSS_BUDGET_MB = 120
+RUNS = 3
+REPORT_PREFIX = 'STARTUP_BUDGET_REPORT '     # marks the child's measurement line on stdout
+
+# Must only be imported on the code paths that need them (ingestion, /summarize, search)
+LAZY_MODULES = ('torch', 'transformers', 'pandas', 'numpy', 'newspaper', 'trafilatura',
+                'bs4', 'feedparser', 'requests', 'httpx')
+
+CHILD = r'''
+import json, resource, sys, time
+start = time.perf_counter()
+import app
+app.create()
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+rss_mb = rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+print(PREFIX + json.dumps({"import_ms": elapsed * 1000, "rss_mb": rss_mb,
+                  "loaded": sorted(m for m in sys.modules if m.split('.')[0] in LAZY)}))
+'''
+
+
+def run_child(extra_args=()):
+    code = f"LAZY = {LAZY_MODULES!r}\nPREFIX = {REPORT_PREFIX!r}\n" + CHILD
+    result = subprocess.run([sys.executable, *extra_args, '-c', code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    # app code may print to stdout while importing; only the prefixed line is the report
+    reports = [line[len(REPORT_PREFIX):] for line in result.stdout.splitlines() if line.startswith(REPORT_PREFIX)]
+    if not reports:
+        raise RuntimeError(f"probe printed no report line; stdout was:\n{result.stdout}")
+    return json.loads(reports[-1]), result.stderr
+
+
+def measure(runs=RUNS):
+    """Best import time and RSS over runs fresh interpreters, plus the heavy modules loaded"""
+    results = [run_child()[0] for _ in range(runs)]
+    return {'import_ms': min(run['import_ms'] for run in results),
+            'rss_mb': min(run['rss_mb'] for run in results),
+            'loaded': results[0]['loaded']}
+
+
+def over_budget(measurement, import_budget_ms=IMPORT_BUDGET_MS, rss_budget_mb=RSS_BUDGET_MB):
+    """What measurement exceeds, as readable strings (empty when within budget)"""
+    failures = []
+    if measurement['import_ms'] > import_budget_ms:
+        failures.append(f"import time {measurement['import_ms']:.0f} ms > {import_budget_ms:.0f} ms")
+    if measurement['rss_mb'] > rss_budget_mb:
+        failures.append(f"RSS {measurement['rss_mb']:.0f} MB > {rss_budget_mb:.0f} MB")
+    if measurement['loaded']:
+        failures.append(f"eagerly imported: {', '.join(measurement['loaded'])}")
+    return failures
+
+
+def slowest_imports(importtime_output, limit):
+    """app and its direct imports, slowest cumulative first"""
+    rows = []
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth <= 1:
+            rows.append((int(cumulative_us), int(self_us), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--check', action='store_true', help='exit 1 when over budget')
+    parser.add_argument('--import-budget-ms', type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument('--rss-budget-mb', type=float, default=RSS_BUDGET_MB)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    measurement = measure()
+
+    _, importtime = run_child(('-X', 'importtime'))
+
+    print("Slowest imports under `app.create()` (cumulative / self, ms):")
+    for cumulative_us, self_us, name in slowest_imports(importtime, args.top):
+        print(f"  {cumulative_us / 1000:8.1f} {self_us / 1000:8.1f}  {name}")
+
+    print()
+    print(f"app startup:   {measurement['import_ms']:8.1f} ms   "
+          f"(budget {args.import_budget_ms:.0f} ms, best of {RUNS})")
+    print(f"baseline RSS:  {measurement['rss_mb']:8.1f} MB   (budget {args.rss_budget_mb:.0f} MB)")
+    print(f"heavy modules loaded at startup: {', '.join(measurement['loaded']) or 'none'}")
+
+    failures = over_budget(measurement, args.import_budget_ms, args.rss_budget_mb)
+
+    if failures:
+        print("\n❌ Over startup budget: " + '; '.join(failures))
+        if args.check:
+            sys.exit(1)
+    else:
+        print("\n✅ Within startup budget")
+
+
+if __name__ == '__main__':
+    main()
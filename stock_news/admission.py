@@ -0,0 +1,200 @@
+"""
+Admission control for expensive endpoints
+
+Each limited endpoint gets a concurrency limit with a small bounded queue and a
+per-user token bucket. Requests that would wait too long are rejected at once
+(Overloaded -> 503 / 429 with Retry-After) instead of piling up threads and
+starving cheap endpoints.
+"""
+import math
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+
+from .metrics import Counter as MetricCounter, Gauge, Histogram
+
+# endpoint -> concurrent slots, queued requests, max queue wait (s), per-user rate (req/s) and burst
+LIMITS = {
+    'summarize': {'max_concurrent': 4, 'max_queue': 8, 'queue_timeout': 5.0, 'rate': 0.2, 'burst': 5},
+    'dashboard': {'max_concurrent': 8, 'max_queue': 16, 'queue_timeout': 3.0, 'rate': 2.0, 'burst': 10},
+    # Password hashing (login/register): slots track the hashing pool; the rate is per submitted
+    # username (routes.login_key), so it slows guessing one account without sharing a bucket per proxy
+    'login': {'max_concurrent': os.cpu_count() or 1, 'max_queue': 4 * (os.cpu_count() or 1),
+              'queue_timeout': 2.0, 'rate': 0.5, 'burst': 10},
+}
+
+queue_wait_seconds = Histogram(
+    'stocknews_admission_queue_wait_seconds', 'Time admitted requests waited for a slot', ('endpoint',))
+rejections_total = MetricCounter(
+    'stocknews_admission_rejections_total', 'Requests rejected by admission control', ('endpoint', 'reason'))
+
+MAX_TRACKED_USERS = 10000   # token buckets kept (least recently seen evicted)
+SERVICE_TIME_SMOOTHING = 0.2
+
+
+class Overloaded(Exception):
+    """Request rejected by admission control"""
+
+    def __init__(self, endpoint, reason, retry_after):
+        super().__init__(f"{endpoint}: {reason}")
+        self.endpoint = endpoint
+        self.reason = reason              # 'queue_full', 'queue_timeout', 'rate_limited' or 'hash_timeout'
+        self.retry_after = max(1, math.ceil(retry_after))
+
+    @property
+    def status_code(self):
+        return 429 if self.reason == 'rate_limited' else 503
+
+
+class ConcurrencyLimiter:
+    """At most max_concurrent holders; up to max_queue waiters for queue_timeout seconds"""
+
+    def __init__(self, name, max_concurrent, max_queue, queue_timeout):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._cond = threading.Condition()
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = Counter()
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.service_time = 1.0         # smoothed seconds per request, for Retry-After
+
+    def retry_after(self):
+        return self.service_time * (self.waiting + 1) / self.max_concurrent
+
+    def acquire(self):
+        started = time.monotonic()
+        with self._cond:
+            # Fast path only when nobody is queued, so waiters are not overtaken
+            if self.active < self.max_concurrent and self.waiting == 0:
+                self.active += 1
+                self.admitted += 1
+                queue_wait_seconds.observe(0.0, self.name)
+                return started
+
+            if self.waiting >= self.max_queue:
+                self.rejected['queue_full'] += 1
+                rejections_total.inc(self.name, 'queue_full')
+                raise Overloaded(self.name, 'queue_full', self.retry_after())
+
+            self.waiting += 1
+            deadline = started + self.queue_timeout
+            try:
+                while self.active >= self.max_concurrent:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.rejected['queue_timeout'] += 1
+                        rejections_total.inc(self.name, 'queue_timeout')
+                        raise Overloaded(self.name, 'queue_timeout', self.retry_after())
+                    self._cond.wait(remaining)
+            finally:
+                self.waiting -= 1
+
+            now = time.monotonic()
+            waited = now - started
+            self.active += 1
+            self.admitted += 1
+            self.queued += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+        queue_wait_seconds.observe(waited, self.name)
+        return now
+
+    def release(self, admitted_at):
+        elapsed = time.monotonic() - admitted_at
+        with self._cond:
+            self.active -= 1
+            self.service_time += SERVICE_TIME_SMOOTHING * (elapsed - self.service_time)
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self):
+        admitted_at = self.acquire()
+        try:
+            yield
+        finally:
+            self.release(admitted_at)
+
+    def stats(self):
+        with self._cond:
+            return {
+                'active': self.active,
+                'waiting': self.waiting,
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'admitted': self.admitted,
+                'queued': self.queued,
+                'rejected': dict(self.rejected),
+                'queue_wait_avg_ms': round(self.wait_total / self.queued * 1000, 1) if self.queued else 0.0,
+                'queue_wait_max_ms': round(self.wait_max * 1000, 1),
+                'service_time_ms': round(self.service_time * 1000, 1),
+            }
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets: `rate` tokens per second, up to `burst` saved"""
+
+    def __init__(self, rate, burst, max_keys=MAX_TRACKED_USERS):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()   # key -> (tokens, last refill)
+        self._lock = threading.Lock()
+        self.limited = 0
+
+    def take(self, key):
+        """Spend one token; returns seconds to wait (0.0 when allowed)"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.pop(key, None)
+            tokens = self.burst if bucket is None else min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                self.limited += 1
+                wait = (1 - tokens) / self.rate
+
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+
+limiters = {name: ConcurrencyLimiter(name, limit['max_concurrent'], limit['max_queue'], limit['queue_timeout'])
+            for name, limit in LIMITS.items()}
+rate_limiters = {name: TokenBucketLimiter(limit['rate'], limit['burst']) for name, limit in LIMITS.items()}
+
+
+@contextmanager
+def admit(endpoint, user_key):
+    """Rate-limit user_key, then hold one of the endpoint's slots; raises Overloaded"""
+    wait = rate_limiters[endpoint].take(user_key)
+    if wait:
+        rejections_total.inc(endpoint, 'rate_limited')
+        raise Overloaded(endpoint, 'rate_limited', wait)
+
+    with limiters[endpoint].slot():
+        yield
+
+
+Gauge('stocknews_admission_in_flight', 'Requests holding or waiting for a slot',
+      lambda: {(name, state): getattr(limiter, state) for name, limiter in limiters.items()
+               for state in ('active', 'waiting')},
+      ('endpoint', 'state'))
+
+
+def stats():
+    result = {}
+    for name, limiter in limiters.items():
+        result[name] = limiter.stats()
+        result[name]['rate_limited'] = rate_limiters[name].limited
+    return result
@@ -0,0 +1,392 @@
+"""
+Watchlist alerts
+
+Every new snapshot generation hands its new articles to submit(); ingestion
+never waits on delivery. The dispatcher thread fans them out to watching users
+through the watchlists' reverse index, applies each user's rule (sentiment
+labels, minimum confidence, sectors, quiet hours), drops repeats and alerts
+over the per-user rate, and delivers the rest in batches through the
+configured sink ($STOCK_NEWS_ALERT_SINK: file, memory, webhook or smtp).
+Alerts suppressed by quiet hours are dropped, not deferred.
+"""
+import itertools
+import json
+import os
+import queue
+import smtplib
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from datetime import datetime
+from email.message import EmailMessage
+
+from . import http_client, json_provider, users
+from .admission import TokenBucketLimiter
+from .companies import SYMBOL_TO_SECTOR, COMPANY_SECTORS
+from .logs import add_log, DEBUG, WARNING, ERROR
+from .metrics import Counter, Histogram
+from .watchlists import match_articles
+
+ALERT_QUEUE_SIZE = 100          # article batches waiting for the dispatcher
+BATCH_SIZE = 200                # alerts per sink call
+BATCH_INTERVAL = 1.0            # seconds a partial batch may wait
+DEDUP_TTL = 24 * 3600           # an article alerts a user at most once per day
+DEDUP_MAX = 100000              # (user, article) keys remembered
+RATE_PER_HOUR = 20              # alerts per user, with bursts of RATE_BURST
+RATE_BURST = 10
+
+ALERT_SINK_ENV = 'STOCK_NEWS_ALERT_SINK'
+WEBHOOK_URL_ENV = 'STOCK_NEWS_ALERT_WEBHOOK'
+SMTP_HOST_ENV = 'STOCK_NEWS_SMTP_HOST'
+SMTP_FROM_ENV = 'STOCK_NEWS_SMTP_FROM'
+ALERTS_FILE = 'user_data/alerts.jsonl'
+DEFAULT_SINK = 'file'
+
+LABELS = ('Positive', 'Negative')
+DEFAULT_RULE = {
+    'enabled': True,
+    'labels': list(LABELS),     # sentiment labels that alert
+    'min_confidence': 0.7,      # sentiment score (0.6-0.9 for Positive/Negative)
+    'sectors': [],              # CSV sectors to alert on; empty = every sector
+    'quiet_hours': None,        # ['22:00', '07:00'] (server local time); None = always on
+}
+
+alerts_total = Counter('stocknews_alerts_total', 'Alert candidates by outcome', ('outcome',))
+alert_batch_seconds = Histogram('stocknews_alert_batch_seconds', 'Time to deliver one alert batch', ('sink',))
+
+
+# **SINKS**
+class FileSink:
+    """JSON lines appended to user_data/alerts.jsonl (local stand-in for real delivery)"""
+    name = 'file'
+
+    def __init__(self, path=ALERTS_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def send(self, batch):
+        payload = b''.join(json_provider.dumps_bytes(alert) + b'\n' for alert in batch)
+        with self.lock, open(self.path, 'ab') as f:
+            f.write(payload)
+
+class MemorySink:
+    """Keeps the newest alerts in memory (tests and benchmarks)"""
+    name = 'memory'
+
+    def __init__(self, maxlen=10000):
+        self.alerts = deque(maxlen=maxlen)
+        self.batches = 0
+
+    def send(self, batch):
+        self.alerts.extend(batch)
+        self.batches += 1
+
+class WebhookSink:
+    """One POST per batch: {"batch_id": ..., "alerts": [...]} to $STOCK_NEWS_ALERT_WEBHOOK"""
+    name = 'webhook'
+
+    def __init__(self, url=None):
+        self.url = url or os.environ[WEBHOOK_URL_ENV]
+        self.batch_ids = itertools.count(1)
+
+    def send(self, batch):
+        body = json_provider.dumps_bytes({'batch_id': f'{os.getpid()}-{next(self.batch_ids)}', 'alerts': batch})
+        response = http_client.post(self.url, body, headers={'Content-Type': 'application/json'})
+        if response.status_code >= 400:
+            raise Exception(f"webhook HTTP {response.status_code}")
+
+class SmtpSink:
+    """One email per user per batch, via $STOCK_NEWS_SMTP_HOST"""
+    name = 'smtp'
+
+    def __init__(self, host=None, sender=None):
+        self.host = host or os.environ[SMTP_HOST_ENV]
+        self.sender = sender or os.environ.get(SMTP_FROM_ENV, 'alerts@localhost')
+
+    def send(self, batch):
+        by_user = defaultdict(list)
+        for alert in batch:
+            by_user[alert['user_id']].append(alert)
+
+        with smtplib.SMTP(self.host, timeout=15) as smtp:
+            for user_id, user_alerts in by_user.items():
+                email = users.get_email(user_id)
+                if not email:
+                    continue
+                message = EmailMessage()
+                message['From'] = self.sender
+                message['To'] = email
+                message['Subject'] = f"📈 {len(user_alerts)} watchlist alert(s): " + ', '.join(
+                    sorted({symbol for alert in user_alerts for symbol in alert['symbols']}))
+                message.set_content('\n\n'.join(
+                    f"{alert['sentiment_label']} ({alert['sentiment']:.2f}) {', '.join(alert['symbols'])}\n"
+                    f"{alert['title']}\n{alert['url']}" for alert in user_alerts))
+                smtp.send_message(message)
+
+SINKS = {
+    'file': FileSink,
+    'memory': MemorySink,
+    'webhook': WebhookSink,
+    'smtp': SmtpSink,
+}
+
+
+# **RULES**
+alert_rules = {'rules': {}, 'lock': threading.Lock()}
+
+def parse_hhmm(value):
+    hours, minutes = value.split(':')
+    hours, minutes = int(hours), int(minutes)
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        raise ValueError(value)
+    return hours * 60 + minutes
+
+def validate_rule(data):
+    """(rule, None) for a valid partial or full rule (missing keys take defaults), else (None, error)"""
+    if not isinstance(data, dict):
+        return None, 'Rule must be an object'
+    unknown = set(data) - set(DEFAULT_RULE)
+    if unknown:
+        return None, f"Unknown fields: {', '.join(sorted(unknown))}"
+
+    rule = dict(DEFAULT_RULE, **data)
+    for field in ('labels', 'sectors'):
+        if not isinstance(rule[field], list) or not all(isinstance(value, str) for value in rule[field]):
+            return None, f'"{field}" must be a list of strings'
+    if not isinstance(rule['enabled'], bool):
+        return None, '"enabled" must be true or false'
+    if not set(rule['labels']) <= set(LABELS):
+        return None, f'"labels" must be a list drawn from {list(LABELS)}'
+    if not isinstance(rule['min_confidence'], (int, float)) or not 0 <= rule['min_confidence'] <= 1:
+        return None, '"min_confidence" must be between 0 and 1'
+    if not set(rule['sectors']) <= set(COMPANY_SECTORS):
+        return None, '"sectors" must be a list of known sectors'
+    if rule['quiet_hours'] is not None:
+        try:
+            start, end = rule['quiet_hours']
+            parse_hhmm(start), parse_hhmm(end)
+        except (TypeError, ValueError, AttributeError):
+            return None, '"quiet_hours" must be null or ["HH:MM", "HH:MM"]'
+    return rule, None
+
+def load_rules():
+    """Read every saved rule into memory (evaluation never touches the database)"""
+    rows = users.get_connection().execute('SELECT user_id, rule FROM alert_rules').fetchall()
+    with alert_rules['lock']:
+        alert_rules['rules'] = {row['user_id']: compile_rule(json.loads(row['rule'])) for row in rows}
+    return len(rows)
+
+def compile_rule(rule):
+    """Rule plus lookup-friendly forms of its fields"""
+    compiled = dict(rule)
+    compiled['label_set'] = frozenset(rule['labels'])
+    compiled['sector_set'] = frozenset(rule['sectors'])
+    compiled['quiet'] = tuple(parse_hhmm(value) for value in rule['quiet_hours']) if rule['quiet_hours'] else None
+    return compiled
+
+DEFAULT_COMPILED = compile_rule(DEFAULT_RULE)
+
+def get_rule(user_id):
+    return {key: value for key, value in alert_rules['rules'].get(user_id, DEFAULT_COMPILED).items()
+            if key in DEFAULT_RULE}
+
+def save_rule(user_id, rule):
+    with users.transaction(users.get_connection()) as conn:
+        conn.execute('INSERT OR REPLACE INTO alert_rules (user_id, rule) VALUES (?, ?)',
+                     (user_id, json.dumps(rule)))
+    with alert_rules['lock']:
+        alert_rules['rules'][user_id] = compile_rule(rule)
+
+def in_quiet_hours(quiet, now):
+    if not quiet:
+        return False
+    start, end = quiet
+    local = datetime.fromtimestamp(now)
+    minute = local.hour * 60 + local.minute
+    return start <= minute < end if start <= end else minute >= start or minute < end
+
+
+# **ENGINE**
+class AlertEngine:
+    """Evaluates new articles against rules and delivers alerts in batches"""
+
+    def __init__(self, sink=None):
+        self.sink = sink
+        self.queue = queue.Queue(maxsize=ALERT_QUEUE_SIZE)
+        self.seen = OrderedDict()           # (user_id, url) -> time alerted
+        self.rate_limiter = TokenBucketLimiter(RATE_PER_HOUR / 3600, RATE_BURST, max_keys=DEDUP_MAX)
+        self.pending = []
+        self.pending_since = None
+        self.outcomes = defaultdict(int)
+        self.batches = 0
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def get_sink(self):
+        """
+        The configured sink, built on first use (warmup builds it, so bad
+        configuration shows at startup). An unknown sink or one missing its
+        settings falls back to the file sink with an ERROR log; never raises.
+        """
+        if self.sink is None:
+            with self.lock:
+                if self.sink is None:
+                    name = os.environ.get(ALERT_SINK_ENV) or DEFAULT_SINK
+                    try:
+                        if name not in SINKS:
+                            raise ValueError(f"unknown sink (choose from {', '.join(SINKS)})")
+                        self.sink = SINKS[name]()
+                    except KeyError as e:
+                        add_log(f"❌ Alert sink '{name}' needs ${e.args[0]}; using the file sink", ERROR, stage='alerts')
+                        self.sink = FileSink()
+                    except Exception as e:
+                        add_log(f"❌ Alert sink '{name}' unusable ({e}); using the file sink", ERROR, stage='alerts')
+                        self.sink = FileSink()
+        return self.sink
+
+    def count(self, outcome, amount=1):
+        if amount:
+            self.outcomes[outcome] += amount
+            alerts_total.inc(outcome, amount=amount)
+
+    def evaluate(self, articles, now=None):
+        """Alerts due for a batch of new articles (updates dedup and rate-limit state)"""
+        now = now or time.time()
+        rules = alert_rules['rules']
+        alerts = []
+        filtered = quiet = duplicates = limited = 0
+
+        # Neutral articles can't satisfy any rule: don't fan them out at all
+        articles = [article for article in articles if article.get('sentiment_label') in LABELS]
+        for user_id, matches in match_articles(articles).items():
+            rule = rules.get(user_id, DEFAULT_COMPILED)
+            if not rule['enabled']:
+                filtered += len(matches)
+                continue
+            if in_quiet_hours(rule['quiet'], now):
+                quiet += len(matches)
+                continue
+
+            for match in matches:
+                article = match['article']
+                symbols = match['symbols']
+                if rule['sector_set']:
+                    symbols = [s for s in symbols if SYMBOL_TO_SECTOR.get(s) in rule['sector_set']]
+                if (not symbols or article.get('sentiment_label') not in rule['label_set']
+                        or article.get('sentiment', 0) < rule['min_confidence']):
+                    filtered += 1
+                    continue
+
+                key = (user_id, article['url'])
+                if key in self.seen:
+                    duplicates += 1
+                    continue
+                if self.rate_limiter.take(user_id):
+                    limited += 1
+                    continue
+                self.seen[key] = now
+
+                alerts.append({
+                    'user_id': user_id,
+                    'symbols': symbols,
+                    'sector': SYMBOL_TO_SECTOR.get(symbols[0]),
+                    'title': article['title'],
+                    'url': article['url'],
+                    'source': article.get('source'),
+                    'sentiment_label': article['sentiment_label'],
+                    'sentiment': article['sentiment'],
+                    'published_date': article.get('published_date'),
+                    'created_at': now,
+                })
+
+        self.expire_seen(now)
+        self.count('filtered', filtered)
+        self.count('quiet_hours', quiet)
+        self.count('duplicate', duplicates)
+        self.count('rate_limited', limited)
+        return alerts
+
+    def expire_seen(self, now):
+        seen = self.seen
+        while seen and (len(seen) > DEDUP_MAX or next(iter(seen.values())) < now - DEDUP_TTL):
+            seen.popitem(last=False)
+
+    def deliver(self, alerts):
+        """Send alerts through the sink in BATCH_SIZE chunks; returns how many were sent"""
+        sink = self.get_sink()
+        sent = 0
+        for start in range(0, len(alerts), BATCH_SIZE):
+            batch = alerts[start:start + BATCH_SIZE]
+            started = time.perf_counter()
+            try:
+                sink.send(batch)
+            except Exception as e:
+                self.count('failed', len(batch))
+                add_log(f"❌ Alert delivery via {sink.name} failed ({len(batch)} alerts): {e}",
+                        ERROR, stage='alerts')
+                continue
+            alert_batch_seconds.observe(time.perf_counter() - started, sink.name)
+            self.batches += 1
+            self.count('sent', len(batch))
+            sent += len(batch)
+        return sent
+
+    def submit(self, articles):
+        """Queue a generation's new articles; never blocks (drops the batch when the queue is full)"""
+        if not articles:
+            return
+        self.ensure_thread()
+        try:
+            self.queue.put_nowait(articles)
+        except queue.Full:
+            self.count('dropped', len(articles))
+            add_log(f"⚠️ Alert queue full, skipped {len(articles)} articles", WARNING, stage='alerts')
+
+    def run(self):
+        while True:
+            timeout = BATCH_INTERVAL if self.pending else None
+            try:
+                articles = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                articles = None
+
+            try:
+                if articles:
+                    alerts = self.evaluate(articles)
+                    if alerts and not self.pending:
+                        self.pending_since = time.monotonic()
+                    self.pending.extend(alerts)
+                    add_log(f"🔔 {len(alerts)} alerts from {len(articles)} new articles", DEBUG, stage='alerts')
+
+                if self.pending and (len(self.pending) >= BATCH_SIZE
+                                     or time.monotonic() - self.pending_since >= BATCH_INTERVAL):
+                    pending, self.pending = self.pending, []
+                    self.deliver(pending)
+            except Exception as e:
+                add_log(f"❌ Alert engine error: {e}", ERROR, stage='alerts')
+
+    def ensure_thread(self):
+        if self.thread is None:
+            with self.lock:
+                if self.thread is None:
+                    thread = threading.Thread(target=self.run, name='alert-dispatcher', daemon=True)
+                    thread.start()
+                    self.thread = thread
+
+    def stats(self):
+        return {
+            'sink': self.get_sink().name,
+            'queued_batches': self.queue.qsize(),
+            'pending_alerts': len(self.pending),
+            'batches_sent': self.batches,
+            'outcomes': dict(self.outcomes),
+            'rules': len(alert_rules['rules']),
+        }
+
+engine = AlertEngine()
+
+def submit(articles):
+    engine.submit(articles)
+
+def stats():
+    return engine.stats()
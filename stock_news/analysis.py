@@ -0,0 +1,172 @@
+"""
+Headline stock extraction, sector classification and rule-based sentiment
+"""
+import re
+
+from .companies import VALID_INDIAN_SYMBOLS, COMPANY_TO_SYMBOL
+from .sectors import ENHANCED_SECTOR_KEYWORDS
+
+POSITIVE_WORDS = [
+    'profit', 'growth', 'up', 'rise', 'gain', 'surge', 'bullish', 'positive', 'beat', 'strong',
+    'earnings', 'revenue', 'high', 'record', 'boost', 'rally', 'jump', 'soar', 'climb', 'upgrade'
+]
+
+NEGATIVE_WORDS = [
+    'loss', 'down', 'fall', 'decline', 'crash', 'bearish', 'negative', 'miss', 'weak', 'drop',
+    'slump', 'plunge', 'tumble', 'collapse', 'worry', 'fear', 'downgrade', 'cut'
+]
+
+symbol_matchers = None
+
+def get_symbol_matchers():
+    """
+    Precompiled (symbol, word pattern, clean-spacing pattern) per valid symbol.
+    Built once (at warmup or first use); ~700 patterns would thrash re's internal cache.
+    """
+    global symbol_matchers
+    if symbol_matchers is None:
+        matchers = []
+        for symbol in VALID_INDIAN_SYMBOLS:
+            word_pattern = re.compile(r'\b' + re.escape(symbol) + r'\b')
+            clean_pattern = None
+            if len(symbol) <= 3:
+                clean_pattern = re.compile(r'(?:^|\s)' + re.escape(symbol) + r'(?:\s|$|\'s|,|\.)')
+            matchers.append((symbol, word_pattern, clean_pattern))
+        symbol_matchers = matchers
+    return symbol_matchers
+
+def extract_stocks_from_headline(title):
+    """
+    Extract stocks ONLY from headline - ULTRA STRICT
+    Excludes short symbols (2-3 letters) unless they appear with stock context
+    """
+    if not title:
+        return []
+    
+    # Stock context words that should appear near the symbol
+    STOCK_CONTEXT = [
+        'share', 'stock', 'equity', 'bse', 'nse', 'sensex', 'nifty',
+        'market', 'trading', 'investors', 'price', 'gains', 'falls',
+        'q1', 'q2', 'q3', 'q4', 'earnings', 'profit', 'loss', 'revenue',
+        'demerger', 'merger', 'acquisition', 'ipo', 'fpo', 'dividend',
+        'rally', 'surge', 'plunge', 'tumbles', 'jumps', 'soars'
+    ]
+    
+    title_upper = title.upper()
+    title_lower = title.lower()
+    
+    valid_stocks = []
+    
+    # Check each symbol with STRICT validation
+    for symbol, word_pattern, clean_pattern in get_symbol_matchers():
+        # For very short symbols (2-3 chars), be EXTRA strict
+        if clean_pattern is not None:
+            # Must appear as standalone word AND have stock context
+            if word_pattern.search(title_upper):
+                # Check if there's stock-related context in title
+                has_context = any(ctx in title_lower for ctx in STOCK_CONTEXT)
+                
+                # Also check if it's mentioned with proper spacing (not part of URL, etc)
+                # Example: "ITC share" ✅ but "Switch" ❌
+                proper_spacing = clean_pattern.search(title_upper)
+                
+                if has_context and proper_spacing:
+                    valid_stocks.append(symbol)
+        
+        # For longer symbols (4+ chars), be less strict
+        elif word_pattern.search(title_upper):
+            valid_stocks.append(symbol)
+    
+    # Check for company names (these are always valid)
+    for company_name, symbol in COMPANY_TO_SYMBOL.items():
+        # Only match reasonably long company names
+        if len(company_name) >= 5 and company_name in title_lower:
+            if symbol not in valid_stocks:
+                valid_stocks.append(symbol)
+    
+    # Check sector-specific company names
+    for sector_data in ENHANCED_SECTOR_KEYWORDS.values():
+        for idx, company_name in enumerate(sector_data['companies']):
+            if len(company_name) >= 5 and company_name in title_lower:
+                if idx < len(sector_data['symbols']):
+                    symbol = sector_data['symbols'][idx]
+                    if symbol in VALID_INDIAN_SYMBOLS and symbol not in valid_stocks:
+                        valid_stocks.append(symbol)
+    
+    # Final cleanup: Remove very common false positives
+    FALSE_POSITIVES = ['IT', 'AM', 'PM', 'IN', 'ON', 'AT', 'TO', 'OR', 'AN', 'AS', 'BE', 'IS']
+    valid_stocks = [s for s in valid_stocks if s not in FALSE_POSITIVES]
+    
+    return valid_stocks[:3]
+
+
+
+def enhanced_sector_classification(title, description):
+    """Classify article into sector"""
+    article_text = f"{title} {description}".lower()
+    
+    sector_scores = {}
+    
+    for sector, data in ENHANCED_SECTOR_KEYWORDS.items():
+        score = 0
+        
+        for company in data['companies']:
+            if company in article_text:
+                score += 10
+        
+        for keyword in data['keywords']:
+            if keyword in article_text:
+                score += 3
+        
+        # Check if sector symbols appear
+        for symbol in data['symbols']:
+            if symbol.lower() in article_text:
+                score += 5
+        
+        if score > 0:
+            sector_scores[sector] = score
+    
+    if sector_scores:
+        best_sector = max(sector_scores.items(), key=lambda x: x[1])
+        if best_sector[1] >= 3:
+            return best_sector[0], {}
+    
+    return None, {}
+
+def enhanced_sentiment_analysis(text, title=""):
+    """Analyze sentiment"""
+    try:
+        combined_text = f"{title} {text}".lower()
+        
+        positive_score = sum(1 for word in POSITIVE_WORDS if word in combined_text)
+        negative_score = sum(1 for word in NEGATIVE_WORDS if word in combined_text)
+        
+        if positive_score > negative_score:
+            return "Positive", min(0.6 + (positive_score * 0.1), 0.9)
+        elif negative_score > positive_score:
+            return "Negative", min(0.6 + (negative_score * 0.1), 0.9)
+        else:
+            return "Neutral", 0.5
+            
+    except Exception as e:
+        return "Neutral", 0.5
+
+def is_indian_news(title, description):
+    """Check if news is related to India"""
+    combined = f"{title} {description}".lower()
+    
+    # Indian market indicators
+    indian_keywords = [
+        'india', 'indian', 'mumbai', 'delhi', 'bangalore',
+        'nse', 'bse', 'sensex', 'nifty', 'rupee', 'rbi',
+        'sebi', 'lic', 'tata', 'reliance', 'adani'
+    ]
+    
+    # Check if any Indian keyword present
+    has_indian_context = any(keyword in combined for keyword in indian_keywords)
+    
+    # Also check if Indian stock symbols present
+    has_indian_stocks = bool(extract_stocks_from_headline(title))
+    
+    return has_indian_context or has_indian_stocks
+
@@ -0,0 +1,50 @@
+"""
+Company master data from company.csv: symbols, names and CSV-defined sectors
+"""
+import csv
+
+# Load company data (stdlib csv)
+def load_company_records(path):
+    """company.csv rows as dicts, header names stripped, rows without name/sector dropped"""
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = [column.strip() for column in next(reader)]
+        records = []
+        for row in reader:
+            record = dict(zip(header, row))
+            if record.get('COMPANY_NAME') and record.get('SECTOR'):
+                records.append(record)
+    return records
+
+try:
+    COMPANY_RECORDS = load_company_records('company.csv')
+    
+    # Create valid symbols set and company name to symbol mapping
+    VALID_INDIAN_SYMBOLS = set(r['SYMBOL'].upper() for r in COMPANY_RECORDS)
+    COMPANY_TO_SYMBOL = {}
+    for row in COMPANY_RECORDS:
+        company_name = row['COMPANY_NAME'].lower()
+        symbol = row['SYMBOL'].upper()
+        COMPANY_TO_SYMBOL[company_name] = symbol
+    
+    print(f"✅ Loaded {len(COMPANY_RECORDS)} companies with {len(VALID_INDIAN_SYMBOLS)} valid symbols")
+except Exception as e:
+    print(f"❌ Error loading company data: {e}")
+    COMPANY_RECORDS = [
+        {'COMPANY_NAME': 'Reliance Industries', 'SYMBOL': 'RELIANCE', 'SECTOR': 'Oil & Gas'},
+        {'COMPANY_NAME': 'TCS', 'SYMBOL': 'TCS', 'SECTOR': 'IT'},
+        {'COMPANY_NAME': 'HDFC Bank', 'SYMBOL': 'HDFCBANK', 'SECTOR': 'Banking'},
+        {'COMPANY_NAME': 'Bharat Electronics', 'SYMBOL': 'BEL', 'SECTOR': 'Defense'}
+    ]
+    VALID_INDIAN_SYMBOLS = set(['RELIANCE', 'TCS', 'HDFCBANK', 'BEL', 'INFY', 'WIPRO', 'ICICIBANK', 'SBIN'])
+    COMPANY_TO_SYMBOL = {
+        'reliance industries': 'RELIANCE',
+        'tcs': 'TCS',
+        'hdfc bank': 'HDFCBANK',
+        'bharat electronics': 'BEL'
+    }
+
+# CSV-defined name and sector per symbol, and sectors in file order
+SYMBOL_TO_NAME = {r['SYMBOL'].upper(): r['COMPANY_NAME'] for r in COMPANY_RECORDS}
+SYMBOL_TO_SECTOR = {r['SYMBOL'].upper(): r['SECTOR'] for r in COMPANY_RECORDS}
+COMPANY_SECTORS = list(dict.fromkeys(r['SECTOR'] for r in COMPANY_RECORDS))
@@ -0,0 +1,40 @@
+"""
+Conditional responses (ETag / 304) and precompressed bodies
+"""
+import hashlib
+import uuid
+
+from flask import Response, make_response, request
+
+BOOT_ID = uuid.uuid4().hex[:8]  # new deploys invalidate old ETags
+
+def make_etag(*parts):
+    raw = '|'.join(str(part) for part in (BOOT_ID,) + parts)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:20]
+
+def not_modified_response(etag):
+    """304 when the client's If-None-Match already has this ETag, else None"""
+    if request.if_none_match.contains_weak(etag):
+        response = make_response('', 304)
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    return None
+
+def with_etag(rv, etag):
+    # Weak: the same tag covers identity/gzip/br variants of one representation
+    response = make_response(rv)
+    response.set_etag(etag, weak=True)
+    response.headers.setdefault('Cache-Control', 'private, no-cache')
+    return response
+
+def compressed_response(entry, headers=None):
+    """Serve a cached entry in the best precompressed encoding the client accepts"""
+    encodings = entry.encodings()
+    encoding = request.accept_encodings.best_match(encodings) if encodings else None
+    
+    response = Response(entry.body(encoding), mimetype=entry.mimetype, headers=headers)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
@@ -0,0 +1,76 @@
+"""
+Named engine profiles
+
+A profile picks the feed set, the /summarize backend and where the news
+snapshot is cached. create_app() activates one profile per process; the rest
+of the package reads the active values from `settings`.
+"""
+import os
+
+from .feeds import FEED_SETS
+
+DEFAULT_PROFILE = 'production'
+PROFILE_ENV = 'STOCK_NEWS_PROFILE'
+
+CACHE_DURATION = 600  # 10 minutes
+SOCKET_TIMEOUT = 15   # seconds; guards libraries that open their own sockets
+
+PROFILES = {
+    # Few feeds, in-process snapshot only: hello.py, quick local runs and benchmarks
+    'lite': {
+        'feeds': 'lite',
+        'summarizer': 'extractive',
+        'cache_backend': 'memory',
+        'max_article_chars': 5000,
+        'log_level': 'INFO',
+        'debug': False,
+    },
+    # Every feed, no model: summaries are the article's first sentences (app.py)
+    'dev': {
+        'feeds': 'full',
+        'summarizer': 'lead',
+        'cache_backend': 'memory',
+        'max_article_chars': None,
+        'log_level': 'DEBUG',       # per-article DEBUG lines are sampled
+        'debug': True,
+    },
+    # Every feed, model summaries when transformers is installed
+    'full': {
+        'feeds': 'full',
+        'summarizer': 'transformers',
+        'cache_backend': 'file',
+        'max_article_chars': None,
+        'log_level': 'DEBUG',       # per-article DEBUG lines are sampled
+        'debug': True,
+    },
+    # Every feed, fast extractive summaries, snapshot shared across restarts (python.py)
+    'production': {
+        'feeds': 'full',
+        'summarizer': 'extractive',
+        'cache_backend': 'file',
+        'max_article_chars': 5000,
+        'log_level': 'INFO',
+        'debug': False,
+    },
+}
+
+settings = {}
+
+
+def resolve_profile(name=None):
+    """Profile name from the argument, then $STOCK_NEWS_PROFILE, then the default"""
+    name = name or os.environ.get(PROFILE_ENV) or DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Unknown profile '{name}' (choose from {', '.join(PROFILES)})")
+    return name
+
+
+def activate(name=None):
+    """Make a profile the active one and return its settings"""
+    name = resolve_profile(name)
+    profile = PROFILES[name]
+    settings.clear()
+    settings.update(profile)
+    settings['name'] = name
+    settings['feeds'] = FEED_SETS[profile['feeds']]
+    return settings
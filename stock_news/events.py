@@ -0,0 +1,119 @@
+"""
+Server-Sent Events fan-out broadcaster
+
+Each event is formatted into an SSE frame once and handed to every subscriber's
+bounded queue, so publishing costs one string build plus a non-blocking put per
+client. Slow clients lose their oldest frames instead of blocking publishers.
+
+Under a threaded WSGI server (waitress) every open stream holds one worker
+thread for as long as the tab stays open, so the subscriber cap must stay well
+below the server's thread count ($STOCK_NEWS_SSE_MAX_SUBSCRIBERS; waitress
+defaults to 4 threads, raise it with --threads). Dashboards normally stream
+from the asyncio server in sse_server.py instead, which is attached here as a
+single listener; clients turned away by both get a 503 and poll /api/logs.
+"""
+import itertools
+import os
+import queue
+import threading
+from collections import deque
+
+SSE_QUEUE_SIZE = 200        # frames buffered per client
+SSE_MAX_SUBSCRIBERS = 2     # each open stream occupies a WSGI worker thread
+SSE_MAX_SUBSCRIBERS_ENV = 'STOCK_NEWS_SSE_MAX_SUBSCRIBERS'
+SSE_REPLAY_SIZE = 100       # frames kept for Last-Event-ID resume
+
+
+def format_sse(event, data, event_id=None):
+    """Build one SSE frame (multi-line data is split into several data: lines)"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    for line in str(data).splitlines() or ['']:
+        lines.append(f"data: {line}")
+    return '\n'.join(lines) + '\n\n'
+
+
+class Subscriber:
+    """One connected client: a bounded queue of pre-formatted frames"""
+
+    def __init__(self, maxsize):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def put(self, frame):
+        while True:
+            try:
+                self.queue.put_nowait(frame)
+                return
+            except queue.Full:
+                # Drop the oldest frame rather than stall the publisher
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout):
+        """Next frame, or None if nothing arrived within timeout"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class EventBroadcaster:
+    """Publish events to many SSE subscribers"""
+
+    def __init__(self, queue_size=SSE_QUEUE_SIZE, max_subscribers=None, replay_size=SSE_REPLAY_SIZE):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers or int(os.environ.get(SSE_MAX_SUBSCRIBERS_ENV) or SSE_MAX_SUBSCRIBERS)
+        self._subscribers = set()
+        self._listeners = []
+        self._recent = deque(maxlen=replay_size)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def subscribe(self, last_event_id=None):
+        """Register a client; returns None when at capacity"""
+        subscriber = Subscriber(self.queue_size)
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            for frame in self.replay(last_event_id):
+                subscriber.put(frame)
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def attach(self, listener):
+        """Register anything with put(frame), outside the subscriber cap (the async SSE server)"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def replay(self, last_event_id):
+        """Frames published after last_event_id that are still kept (none for a missing/bad id)"""
+        try:
+            last_id = int(last_event_id)
+        except (TypeError, ValueError):
+            return []
+        return [frame for event_id, frame in list(self._recent) if event_id > last_id]
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, event, data):
+        with self._lock:
+            event_id = next(self._ids)
+            frame = format_sse(event, data, event_id)
+            self._recent.append((event_id, frame))
+            subscribers = list(self._subscribers) + self._listeners
+
+        for subscriber in subscribers:
+            subscriber.put(frame)
+        return event_id
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
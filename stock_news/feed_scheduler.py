@@ -0,0 +1,254 @@
+"""
+Per-feed health tracking and adaptive polling
+
+Every feed keeps a small stats record (recent latencies, recent outcomes, links
+already seen) and its last good articles. After each poll the feed's next
+interval is derived from how many new entries it has been publishing: busy
+feeds are polled down to MIN_INTERVAL, quiet ones back off to MAX_INTERVAL.
+Feeds that keep failing trip a circuit breaker and are skipped until a
+cooldown passes, then probed once (half-open) before being trusted again.
+"""
+import threading
+import time
+from collections import OrderedDict, deque
+
+from .config import CACHE_DURATION
+from .ingestion import fetch_feeds, FEED_JOIN_TIMEOUT
+from .logs import add_log, WARNING
+from .metrics import Gauge
+
+SCHEDULER_TICK = 15             # seconds between checks for due feeds
+DEFAULT_INTERVAL = CACHE_DURATION
+MIN_INTERVAL = 120
+MAX_INTERVAL = 3600
+TARGET_NEW_PER_POLL = 3         # aim for about this many new entries per poll
+IDLE_BACKOFF = 1.5              # interval multiplier after a poll with nothing new
+RATE_SMOOTHING = 0.3            # EWMA weight of the latest new-entries/hour sample
+
+FAILURE_THRESHOLD = 3           # consecutive failures that open the breaker
+BREAKER_COOLDOWN = 300          # first open period; doubles per trip
+MAX_BREAKER_COOLDOWN = 3600
+
+LATENCY_WINDOW = 50             # polls kept for latency percentiles
+OUTCOME_WINDOW = 20             # polls kept for the error rate
+SEEN_LINKS_MAX = 500            # links remembered per feed for new-entry detection
+
+
+class FeedState:
+    """Stats, schedule and breaker state for one feed"""
+
+    def __init__(self, name, url):
+        self.name = name
+        self.url = url
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.outcomes = deque(maxlen=OUTCOME_WINDOW)    # True = success
+        self.seen_links = OrderedDict()
+        self.polls = 0
+        self.errors = 0
+        self.entries_total = 0
+        self.new_entries_total = 0
+        self.new_per_hour = None
+        self.interval = DEFAULT_INTERVAL
+        self.next_due = 0.0
+        self.last_polled = None
+        self.last_success = None
+        self.last_error = None
+        self.consecutive_failures = 0
+        self.breaker = 'closed'                         # closed / open / half_open
+        self.breaker_until = 0.0
+        self.breaker_trips = 0
+        self.articles = None                            # last good sector -> articles
+
+    def is_due(self, now):
+        if self.breaker == 'open':
+            if now < self.breaker_until:
+                return False
+            self.breaker = 'half_open'
+            return True
+        return now >= self.next_due
+
+    def percentile(self, p):
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+    def error_rate(self):
+        if not self.outcomes:
+            return None
+        return 1 - sum(self.outcomes) / len(self.outcomes)
+
+    def record(self, now, seconds, error, links, articles):
+        """Fold one poll into the stats and schedule the next one"""
+        previous_poll = self.last_polled
+        self.polls += 1
+        self.last_polled = now
+        self.latencies.append(seconds)
+        self.outcomes.append(error is None)
+
+        if error is not None:
+            self.errors += 1
+            self.last_error = error
+            self.consecutive_failures += 1
+            if self.breaker == 'half_open' or self.consecutive_failures >= FAILURE_THRESHOLD:
+                self.trip(now)
+            else:
+                self.next_due = now + self.interval
+            return
+
+        self.last_success = now
+        self.consecutive_failures = 0
+        if self.breaker != 'closed':
+            add_log(f"✅ {self.name}: circuit closed", stage='scheduler', feed=self.name)
+        self.breaker = 'closed'
+        self.breaker_trips = 0
+        self.articles = articles
+
+        new_links = [link for link in links if link not in self.seen_links]
+        for link in new_links:
+            self.seen_links[link] = True
+        while len(self.seen_links) > SEEN_LINKS_MAX:
+            self.seen_links.popitem(last=False)
+        self.entries_total += len(links)
+        self.new_entries_total += len(new_links)
+
+        # The first poll sees the whole feed as "new"; rates start from the second
+        if previous_poll is not None:
+            hours = max(now - previous_poll, 1) / 3600
+            sample = len(new_links) / hours
+            self.new_per_hour = sample if self.new_per_hour is None else (
+                self.new_per_hour + RATE_SMOOTHING * (sample - self.new_per_hour))
+
+            if new_links and self.new_per_hour:
+                self.interval = TARGET_NEW_PER_POLL / self.new_per_hour * 3600
+            elif not new_links:
+                self.interval *= IDLE_BACKOFF
+            self.interval = min(MAX_INTERVAL, max(MIN_INTERVAL, self.interval))
+
+        self.next_due = now + self.interval
+
+    def trip(self, now):
+        self.breaker_trips += 1
+        cooldown = min(MAX_BREAKER_COOLDOWN, BREAKER_COOLDOWN * 2 ** (self.breaker_trips - 1))
+        self.breaker = 'open'
+        self.breaker_until = now + cooldown
+        self.next_due = self.breaker_until
+        add_log(f"⛔ {self.name}: circuit open for {cooldown}s after {self.consecutive_failures} failures "
+                f"({self.last_error})", WARNING, stage='scheduler', feed=self.name)
+
+    def status(self, now):
+        def rounded(value, digits=3):
+            return round(value, digits) if value is not None else None
+
+        return {
+            'name': self.name,
+            'url': self.url,
+            'breaker': self.breaker,
+            'breaker_until': self.breaker_until if self.breaker == 'open' else None,
+            'interval': round(self.interval),
+            'next_poll_in': max(0, round(self.next_due - now)),
+            'polls': self.polls,
+            'errors': self.errors,
+            'error_rate': rounded(self.error_rate()),
+            'consecutive_failures': self.consecutive_failures,
+            'last_error': self.last_error,
+            'last_polled': self.last_polled,
+            'last_success': self.last_success,
+            'latency_p50': rounded(self.percentile(50)),
+            'latency_p90': rounded(self.percentile(90)),
+            'latency_p99': rounded(self.percentile(99)),
+            'entries_total': self.entries_total,
+            'new_entries_total': self.new_entries_total,
+            'new_per_hour': rounded(self.new_per_hour, 1),
+            'articles': sum(len(v) for v in self.articles.values()) if self.articles else 0,
+        }
+
+
+feed_states = OrderedDict()
+state_lock = threading.Lock()       # guards feed_states and FeedState fields (held briefly)
+poll_lock = threading.Lock()        # one poll round at a time (held across fetches)
+
+Gauge('stocknews_feed_circuit_open', 'Feeds whose circuit breaker is open',
+      lambda: sum(1 for state in list(feed_states.values()) if state.breaker == 'open'))
+Gauge('stocknews_feed_poll_interval_seconds', 'Current adaptive poll interval per feed',
+      lambda: {(state.name,): state.interval for state in list(feed_states.values())}, ('feed',))
+
+
+def configure(feeds):
+    """Track exactly these feeds (name -> url), keeping state for ones already known"""
+    with state_lock:
+        for name in [name for name in feed_states if name not in feeds]:
+            del feed_states[name]
+        for name, url in feeds.items():
+            if name not in feed_states or feed_states[name].url != url:
+                feed_states[name] = FeedState(name, url)
+
+
+def seed(feed_articles, timestamp):
+    """Restore last good articles per feed from a snapshot taken at `timestamp`"""
+    with state_lock:
+        for name, articles in feed_articles.items():
+            state = feed_states.get(name)
+            if state is not None and state.articles is None:
+                state.articles = articles
+                state.next_due = timestamp + state.interval
+
+
+def poll_feeds(now=None, due_only=True):
+    """
+    Poll due feeds (or every feed not behind an open breaker), update their
+    stats and return True when any feed's articles changed
+    """
+    with poll_lock:
+        now = now or time.time()
+        with state_lock:
+            states = [state for state in feed_states.values()
+                      if (state.is_due(now) if due_only else state.breaker != 'open' or state.is_due(now))]
+        if not states:
+            return False
+
+        results = fetch_feeds({state.name: state.url for state in states})
+
+        changed = False
+        with state_lock:
+            for state in states:
+                articles, outcome = results.get(state.name) or (None, {
+                    'seconds': FEED_JOIN_TIMEOUT, 'error': 'timed out', 'links': []})
+                before = article_urls(state.articles)
+                state.record(now, outcome['seconds'], outcome['error'], outcome['links'], articles)
+                if article_urls(state.articles) != before:
+                    changed = True
+        return changed
+
+
+def article_urls(sector_articles):
+    if not sector_articles:
+        return frozenset()
+    return frozenset(art['url'] for articles in sector_articles.values() for art in articles)
+
+
+def merged_articles():
+    """Union of every feed's last good articles, by sector"""
+    merged = {}
+    with state_lock:
+        for state in feed_states.values():
+            for sector, articles in (state.articles or {}).items():
+                merged.setdefault(sector, []).extend(articles)
+    return merged
+
+
+def feed_articles():
+    with state_lock:
+        return {state.name: state.articles for state in feed_states.values() if state.articles is not None}
+
+
+def status():
+    now = time.time()
+    with state_lock:
+        feeds = [state.status(now) for state in feed_states.values()]
+    return {
+        'generated_at': now,
+        'tick': SCHEDULER_TICK,
+        'feeds': feeds,
+        'open_circuits': sum(1 for feed in feeds if feed['breaker'] == 'open'),
+    }
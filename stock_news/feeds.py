@@ -0,0 +1,92 @@
+"""
+RSS feed sets, selected by the active profile
+"""
+
+# Every Indian market feed we know about
+FULL_FEEDS = {
+    # Economic Times
+    "economic_times_market": "https://economictimes.indiatimes.com/markets/rssfeeds/1977021501.cms",
+    "economic_times_stocks": "https://economictimes.indiatimes.com/markets/stocks/rssfeeds/2146842.cms",
+    "economic_times_ipos": "https://economictimes.indiatimes.com/markets/ipo/rssfeeds/67812142.cms",
+    "economic_times_commodities": "https://economictimes.indiatimes.com/markets/commodities/rssfeeds/1808152121.cms",
+    
+    # Moneycontrol
+    "moneycontrol": "https://www.moneycontrol.com/rss/business.xml",
+    "moneycontrol_news": "https://www.moneycontrol.com/rss/latestnews.xml",
+    "moneycontrol_markets": "https://www.moneycontrol.com/rss/marketreports.xml",
+    "moneycontrol_stocks": "https://www.moneycontrol.com/rss/stockmarket.xml",
+    
+    # Business Standard
+    "business_standard": "https://www.business-standard.com/rss/markets-106.rss",
+    "business_standard_companies": "https://www.business-standard.com/rss/companies-101.rss",
+    "business_standard_economy": "https://www.business-standard.com/rss/economy-policy-102.rss",
+    
+    # Financial Express
+    "financial_express": "https://www.financialexpress.com/market/feed/",
+    "financial_express_industry": "https://www.financialexpress.com/industry/feed/",
+    
+    # Livemint
+    "livemint": "https://www.livemint.com/rss/markets",
+    "livemint_companies": "https://www.livemint.com/rss/companies",
+    "livemint_money": "https://www.livemint.com/rss/money",
+    
+    # NDTV Profit
+    "ndtv_business": "https://feeds.feedburner.com/ndtvprofit-latest",
+    
+    # Zee Business
+    "zeebiz": "https://www.zeebiz.com/rss/markets.xml",
+    "zeebiz_personal_finance": "https://www.zeebiz.com/rss/personal-finance.xml",
+    "zeebiz_stocks": "https://www.zeebiz.com/rss/market-news.xml",
+    
+    # CNBC TV18
+    "cnbc_market": "https://www.cnbctv18.com/rss/marketnews.xml",
+    "cnbc_business": "https://www.cnbctv18.com/rss/latestnews.xml",
+    
+    # Google News
+    "google_india_business": "https://news.google.com/rss/topics/CAAqJggKIiBDQkFTRWdvSUwyMHZNRFp0Y0RvU0FtVnVHZ0pKVGtnQVAB?hl=en-IN&gl=IN&ceid=IN:en",
+    "google_india_stocks": "https://news.google.com/rss/search?q=indian%20stocks&hl=en-IN&gl=IN&ceid=IN:en",
+    "google_sensex": "https://news.google.com/rss/search?q=sensex&hl=en-IN&gl=IN&ceid=IN:en",
+    "google_nifty": "https://news.google.com/rss/search?q=nifty&hl=en-IN&gl=IN&ceid=IN:en",
+    
+    # Business Today
+    "business_today_markets": "https://www.businesstoday.in/rss/market",
+    "business_today_companies": "https://www.businesstoday.in/rss/company",
+    
+    # BQ Prime (BloombergQuint)
+    "bq_prime_markets": "https://www.bqprime.com/markets.rss",
+    "bq_prime_business": "https://www.bqprime.com/business.rss",
+    
+    # Hindu Business Line
+    "hindu_business_line": "https://www.thehindubusinessline.com/markets/stock-markets/feeder/default.rss",
+    
+    # India Today
+    "india_today_business": "https://www.indiatoday.in/rss/1206514",
+    
+    # Times of India Business
+    "toi_business": "https://timesofindia.indiatimes.com/rssfeeds/1898055.cms",
+    
+    # Reuters
+    "reuters_india": "https://www.reuters.com/rssFeed/INbusinessNews",
+    
+    # Investing.com India
+    "investing_india": "https://www.investing.com/rss/news_301.rss",
+}
+
+# The ten highest-yield feeds (fast refresh, fewer outbound connections)
+LITE_FEEDS = {
+    "economic_times_market": "https://economictimes.indiatimes.com/markets/rssfeeds/1977021501.cms",
+    "economic_times_stocks": "https://economictimes.indiatimes.com/markets/stocks/rssfeeds/2146842.cms",
+    "moneycontrol": "https://www.moneycontrol.com/rss/business.xml",
+    "moneycontrol_news": "https://www.moneycontrol.com/rss/latestnews.xml",
+    "business_standard": "https://www.business-standard.com/rss/markets-106.rss",
+    "financial_express": "https://www.financialexpress.com/market/feed/",
+    "livemint": "https://www.livemint.com/rss/markets",
+    "zeebiz": "https://www.zeebiz.com/rss/markets.xml",
+    "google_india_stocks": "https://news.google.com/rss/search?q=indian%20stocks&hl=en-IN&gl=IN&ceid=IN:en",
+    "google_sensex": "https://news.google.com/rss/search?q=sensex&hl=en-IN&gl=IN&ceid=IN:en",
+}
+
+FEED_SETS = {
+    'lite': LITE_FEEDS,
+    'full': FULL_FEEDS,
+}
@@ -0,0 +1,161 @@
+"""
+Shared HTTP client for every outbound fetch (RSS feeds, redirects, article pages)
+
+One process-wide client keeps per-host keep-alive pools, so repeated fetches to
+the same publishers reuse TCP/TLS connections. Uses httpx with HTTP/2 when
+httpx + h2 are installed, otherwise a pooled requests.Session.
+"""
+import random
+import threading
+import time
+from importlib.util import find_spec
+
+# Backends are imported when the client is first built, not at app startup
+HTTP2_AVAILABLE = find_spec('httpx') is not None and find_spec('h2') is not None
+BROTLI_AVAILABLE = find_spec('brotli') is not None or find_spec('brotlicffi') is not None  # lets requests/httpx decode "br"
+
+# Timeout / retry policy shared by every fetch path
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 15
+MAX_RETRIES = 2
+BACKOFF_FACTOR = 0.5        # 0.5s, 1s, 2s ... plus jitter
+MAX_BACKOFF = 8
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Connection pools
+POOL_HOSTS = 32             # distinct publishers kept warm
+POOL_PER_HOST = 10          # keep-alive connections per publisher
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (compatible; StockNewsAnalyzer/1.0)',
+    'Accept-Encoding': 'gzip, deflate, br' if BROTLI_AVAILABLE else 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+
+
+class HttpResponse:
+    """Backend-independent response: final url, status, headers and body"""
+
+    __slots__ = ('url', 'status_code', 'headers', 'content', 'encoding')
+
+    def __init__(self, url, status_code, headers, content, encoding=None):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+
+    @property
+    def ok(self):
+        return 200 <= self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+
+class HttpClient:
+    """Thread-safe pooled client with one timeout and retry/backoff policy"""
+
+    def __init__(self):
+        if HTTP2_AVAILABLE:
+            import httpx
+
+            self.backend = 'httpx'
+            self._client = httpx.Client(
+                http2=True,
+                follow_redirects=True,
+                headers=DEFAULT_HEADERS,
+                timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=POOL_HOSTS * POOL_PER_HOST,
+                    max_keepalive_connections=POOL_HOSTS * 2,
+                ),
+            )
+        else:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            self.backend = 'requests'
+            self._client = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_PER_HOST, max_retries=0)
+            self._client.mount('http://', adapter)
+            self._client.mount('https://', adapter)
+            self._client.headers.update(DEFAULT_HEADERS)
+
+    def _send(self, method, url, headers, content=None):
+        if self.backend == 'httpx':
+            response = self._client.request(method, url, headers=headers, content=content)
+            return HttpResponse(str(response.url), response.status_code, response.headers,
+                                response.content, response.encoding)
+
+        response = self._client.request(method, url, headers=headers, data=content, allow_redirects=True,
+                                        timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+        return HttpResponse(response.url, response.status_code, response.headers,
+                            response.content, response.encoding or response.apparent_encoding)
+
+    def request(self, method, url, headers=None, content=None):
+        """Send a request, retrying connection errors and 429/5xx with backoff"""
+        attempt = 0
+        while True:
+            try:
+                response = self._send(method, url, headers, content)
+            except Exception:
+                if attempt >= MAX_RETRIES:
+                    raise
+                delay = None
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= MAX_RETRIES:
+                    return response
+                delay = _retry_after(response.headers.get('Retry-After'))
+
+            if delay is None:
+                delay = BACKOFF_FACTOR * (2 ** attempt)
+            time.sleep(min(delay, MAX_BACKOFF) + random.uniform(0, BACKOFF_FACTOR))
+            attempt += 1
+
+    def get(self, url, headers=None):
+        return self.request('GET', url, headers)
+
+    def head(self, url, headers=None):
+        return self.request('HEAD', url, headers)
+
+    def post(self, url, content, headers=None):
+        return self.request('POST', url, headers, content)
+
+    def close(self):
+        self._client.close()
+
+
+def _retry_after(value):
+    """Seconds from a numeric Retry-After header, or None"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Process-wide shared client (created on first use)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
+
+
+def get(url, headers=None):
+    return get_client().get(url, headers)
+
+
+def head(url, headers=None):
+    return get_client().head(url, headers)
+
+
+def post(url, content, headers=None):
+    return get_client().post(url, content, headers)
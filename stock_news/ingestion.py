@@ -0,0 +1,198 @@
+"""
+Feed download and per-article processing
+"""
+import hashlib
+import queue
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from . import http_client
+from .analysis import (extract_stocks_from_headline, enhanced_sector_classification,
+                       enhanced_sentiment_analysis, is_indian_news)
+from .logs import add_log, DEBUG, ERROR
+from .metrics import (pipeline_stage_seconds, feed_fetch_seconds, feed_entries, feed_articles_total,
+                      feed_bytes_total, feed_errors_total)
+
+FEED_JOIN_TIMEOUT = 30  # seconds a poll round waits for each feed thread
+
+def article_id(url):
+    """Stable short id for an article (same URL from several feeds -> same id)"""
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]
+
+def fetch_feed(feed_url, feed_name=None):
+    """Download a feed over the shared HTTP client and parse it"""
+    import feedparser
+    
+    started = time.perf_counter()
+    response = http_client.get(feed_url)
+    fetched = time.perf_counter()
+    pipeline_stage_seconds.observe(fetched - started, 'fetch')
+    if feed_name:
+        feed_bytes_total.inc(feed_name, amount=len(response.content))
+    
+    if not response.ok:
+        raise Exception(f"HTTP {response.status_code}")
+    
+    response_headers = {k.lower(): v for k, v in response.headers.items()}
+    response_headers['content-location'] = response.url
+    feed = feedparser.parse(response.content, response_headers=response_headers)
+    pipeline_stage_seconds.observe(time.perf_counter() - fetched, 'parse')
+    return feed
+
+def process_rss_feed_enhanced(feed_name, feed_url, results_queue, max_articles=20):
+    """
+    Process RSS feed - ONLY LAST 24 HOURS NEWS
+
+    Puts (feed_name, sector_articles, outcome) on results_queue; sector_articles
+    is None when the feed failed. outcome carries the fetch time, the error
+    (or None) and every entry link, for the feed scheduler.
+    """
+    feed_started = time.perf_counter()
+    outcome = {'seconds': 0.0, 'error': None, 'links': []}
+    try:
+        from bs4 import BeautifulSoup
+        
+        add_log(f"🔄 Processing {feed_name}...", DEBUG, stage='fetch', feed=feed_name)
+        
+        feed = fetch_feed(feed_url, feed_name)
+        
+        if not hasattr(feed, 'entries') or len(feed.entries) == 0:
+            feed_entries.observe(0, feed_name)
+            outcome['seconds'] = time.perf_counter() - feed_started
+            results_queue.put((feed_name, {}, outcome))
+            return
+        
+        sector_articles = defaultdict(list)
+        processed_count = 0
+        
+        # Calculate 24-hour cutoff time
+        cutoff_time = datetime.now() - timedelta(hours=50)
+        
+        entries = feed.entries[:max_articles]
+        outcome['links'] = [entry.get('link', '') for entry in entries if entry.get('link')]
+        for entry in entries:
+            title = entry.get('title', '')
+            link = entry.get('link', '')
+            t0 = time.perf_counter()
+            description = BeautifulSoup(entry.get('summary', ''), 'html.parser').get_text()
+            pipeline_stage_seconds.observe(time.perf_counter() - t0, 'html_strip')
+            
+            if not title or not link:
+                continue
+            
+            # **NEW: Check publication date**
+            pub_date = None
+            
+            # Try to get published date from feed
+            if hasattr(entry, 'published_parsed') and entry.published_parsed:
+                try:
+                    pub_date = datetime.fromtimestamp(time.mktime(entry.published_parsed))
+                except:
+                    pass
+            
+            # Alternative: Check updated_parsed
+            if not pub_date and hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+                try:
+                    pub_date = datetime.fromtimestamp(time.mktime(entry.updated_parsed))
+                except:
+                    pass
+            
+            # **FILTER: Skip if older than 24 hours**
+            if pub_date and pub_date < cutoff_time:
+                add_log(f"⏭️ Skipping old article: {title[:50]}... (published {pub_date})",
+                        DEBUG, stage='filter', feed=feed_name, sample=True)
+                continue
+            
+            # If no date found, include anyway (assume recent)
+            if not pub_date:
+                add_log(f"⚠️ No date for: {title[:50]}... (including anyway)",
+                        DEBUG, stage='filter', feed=feed_name, sample=True)
+            
+            # Check if Indian news
+            t0 = time.perf_counter()
+            indian = is_indian_news(title, description)
+            t1 = time.perf_counter()
+            pipeline_stage_seconds.observe(t1 - t0, 'india_filter')
+            if not indian:
+                continue
+            
+            # Extract stocks ONLY from headline
+            stock_mentions = extract_stocks_from_headline(title)
+            t0 = time.perf_counter()
+            pipeline_stage_seconds.observe(t0 - t1, 'extract_stocks')
+            
+            # Skip if no stocks in headline
+            if not stock_mentions:
+                continue
+            
+            sector, matches = enhanced_sector_classification(title, description)
+            t1 = time.perf_counter()
+            pipeline_stage_seconds.observe(t1 - t0, 'classify')
+            
+            if sector:
+                sentiment_label, sentiment_score = enhanced_sentiment_analysis(description, title)
+                pipeline_stage_seconds.observe(time.perf_counter() - t1, 'sentiment')
+                
+                article_data = {
+                    'id': article_id(link),
+                    'title': title,
+                    'description': description,
+                    'url': link,
+                    'sentiment': sentiment_score,
+                    'sentiment_label': sentiment_label,
+                    'source': feed_name.replace('_', ' ').title(),
+                    'stock_mentions': stock_mentions,
+                    'summary': description[:150],
+                    'published_date': pub_date.strftime("%Y-%m-%d %H:%M") if pub_date else "Unknown"
+                }
+                
+                sector_articles[sector].append(article_data)
+                processed_count += 1
+        
+        feed_entries.observe(len(entries), feed_name)
+        feed_articles_total.inc(feed_name, amount=processed_count)
+        outcome['seconds'] = time.perf_counter() - feed_started
+        results_queue.put((feed_name, dict(sector_articles), outcome))
+        add_log(f"✅ {feed_name}: {processed_count} articles from last 24 hours", stage='fetch', feed=feed_name)
+        
+    except Exception as e:
+        feed_errors_total.inc(feed_name)
+        add_log(f"❌ Error in {feed_name}: {str(e)}", ERROR, stage='fetch', feed=feed_name)
+        outcome['seconds'] = time.perf_counter() - feed_started
+        outcome['error'] = str(e) or type(e).__name__
+        results_queue.put((feed_name, None, outcome))
+    finally:
+        feed_fetch_seconds.observe(time.perf_counter() - feed_started, feed_name)
+
+
+def fetch_feeds(feeds):
+    """
+    Fetch feeds (name -> url) in parallel; returns name -> (sector_articles, outcome).
+    Feeds still running after FEED_JOIN_TIMEOUT are missing from the result.
+    """
+    results_queue = queue.Queue()
+    threads = []
+    
+    for feed_name, feed_url in feeds.items():
+        thread = threading.Thread(
+            target=process_rss_feed_enhanced,
+            args=(feed_name, feed_url, results_queue),
+            daemon=True
+        )
+        threads.append(thread)
+        thread.start()
+    
+    deadline = time.monotonic() + FEED_JOIN_TIMEOUT
+    for thread in threads:
+        thread.join(timeout=max(0, deadline - time.monotonic()))
+    
+    results = {}
+    while True:
+        try:
+            feed_name, sector_articles, outcome = results_queue.get_nowait()
+        except queue.Empty:
+            break
+        results[feed_name] = (sector_articles, outcome)
+    return results
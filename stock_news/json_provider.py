@@ -0,0 +1,99 @@
+"""
+Fast JSON serialization for API responses and user-data storage
+
+Uses orjson when installed, then msgspec, and falls back to the stdlib json
+module, so the app runs unchanged without either package. The same typed
+encoder handles the structures we store and return (sets of symbols,
+datetimes, numpy/pandas scalars).
+"""
+import json
+from datetime import date, datetime
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if orjson is not None:
+    BACKEND = 'orjson'
+elif msgspec is not None:
+    BACKEND = 'msgspec'
+else:
+    BACKEND = 'json'
+
+
+def encode_default(obj):
+    """Typed encoder for values the fast paths don't know natively"""
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if hasattr(obj, 'item') and hasattr(obj, 'dtype'):
+        return obj.item()  # numpy / pandas scalar
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if BACKEND == 'orjson':
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps_bytes(obj, indent=False):
+        option = _ORJSON_OPTS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=encode_default, option=option)
+
+    def loads(data):
+        return orjson.loads(data)
+
+elif BACKEND == 'msgspec':
+    _encoder = msgspec.json.Encoder(enc_hook=encode_default)
+    _decoder = msgspec.json.Decoder()
+
+    def dumps_bytes(obj, indent=False):
+        data = _encoder.encode(obj)
+        return msgspec.json.format(data, indent=2) if indent else data
+
+    def loads(data):
+        return _decoder.decode(data)
+
+else:
+    def dumps_bytes(obj, indent=False):
+        if indent:
+            return json.dumps(obj, default=encode_default, ensure_ascii=False, indent=2).encode('utf-8')
+        return json.dumps(obj, default=encode_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def loads(data):
+        return json.loads(data)
+
+
+def dumps(obj, indent=False):
+    return dumps_bytes(obj, indent).decode('utf-8')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by dumps_bytes()/loads()"""
+
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs):
+        # Callers asking for stdlib-specific options keep stdlib behaviour
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(dumps_bytes(obj, indent) + b"\n", mimetype=self.mimetype)
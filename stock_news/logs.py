@@ -0,0 +1,158 @@
+"""
+Structured processing log: a fixed-size ring buffer of leveled records
+
+A record's slot is sequence % LOG_BUFFER_SIZE; the sequence is taken, the
+record stored and the cursor published under one tiny lock, so readers never
+see the cursor move backwards or point at an unwritten slot. Records below the
+configured level are dropped before any formatting, and per-article DEBUG
+records can be sampled. A background thread, woken per append, tails the ring
+to print records (to stderr, keeping stdout for program output) and push them
+over SSE, so logging threads never wait on the console or subscribers.
+"""
+import itertools
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from .events import EventBroadcaster
+from .metrics import Gauge
+
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING', ERROR: 'ERROR'}
+LEVELS = {name: level for level, name in LEVEL_NAMES.items()}
+
+LOG_BUFFER_SIZE = 1024      # records kept for /api/logs and the dashboard
+LOG_LEVEL_ENV = 'STOCK_NEWS_LOG_LEVEL'
+
+# Live push channel for logs and snapshot updates
+event_broadcaster = EventBroadcaster()
+Gauge('stocknews_sse_subscribers', 'Connected /api/stream clients', event_broadcaster.subscriber_count)
+
+log_settings = {
+    'level': INFO,
+    'debug_sample_every': 20,   # keep 1 in N sampled DEBUG records
+}
+
+_ring = [None] * LOG_BUFFER_SIZE
+_sequence = itertools.count(1)
+_last_sequence = 0
+_append_lock = threading.Lock()
+_samples = {}               # stage -> itertools.count, for sampled DEBUG records
+_emitter = {'thread': None, 'wake': threading.Event(), 'lock': threading.Lock(), 'missed': 0}
+Gauge('stocknews_log_emit_missed', 'Records overwritten before the emitter printed them',
+      lambda: _emitter['missed'])
+
+
+def set_level(level):
+    """Minimum level kept; a name ('DEBUG') or number. $STOCK_NEWS_LOG_LEVEL wins"""
+    level = os.environ.get(LOG_LEVEL_ENV) or level
+    log_settings['level'] = LEVELS[level.upper()] if isinstance(level, str) else level
+
+
+def format_record(record):
+    timestamp = datetime.fromtimestamp(record['ts']).strftime("%H:%M:%S")
+    return f"[{timestamp}] {record['message']}"
+
+
+def add_log(message, level=INFO, stage='app', feed=None, sample=False):
+    """
+    Record a log line. sample=True marks high-volume per-article DEBUG
+    messages: only every log_settings['debug_sample_every']-th per stage is kept.
+    """
+    global _last_sequence
+    if level < log_settings['level']:
+        return
+    if sample:
+        counter = _samples.get(stage)
+        if counter is None:
+            counter = _samples.setdefault(stage, itertools.count())
+        if next(counter) % log_settings['debug_sample_every']:
+            return
+
+    record = {
+        'seq': None,
+        'ts': time.time(),
+        'level': LEVEL_NAMES.get(level, str(level)),
+        'stage': stage,
+        'feed': feed,
+        'message': message,
+    }
+    with _append_lock:
+        seq = record['seq'] = next(_sequence)
+        _ring[seq % LOG_BUFFER_SIZE] = record
+        _last_sequence = seq
+    ensure_emitter()
+    _emitter['wake'].set()
+
+
+def emit_loop():
+    """Tail the ring: print records and push them to SSE clients, off the logging threads"""
+    cursor = 0
+    wake = _emitter['wake']
+    while True:
+        wake.wait()
+        wake.clear()
+        newest = _last_sequence
+        if newest - cursor > LOG_BUFFER_SIZE:
+            _emitter['missed'] += newest - LOG_BUFFER_SIZE - cursor
+            cursor = newest - LOG_BUFFER_SIZE
+
+        for seq in range(cursor + 1, newest + 1):
+            record = _ring[seq % LOG_BUFFER_SIZE]
+            cursor = seq
+            if record['seq'] != seq:
+                _emitter['missed'] += 1
+                continue
+            line = format_record(record)
+            try:
+                print(line, file=sys.stderr, flush=True)
+            except Exception:
+                pass
+            event_broadcaster.publish('log', line)
+
+
+def ensure_emitter():
+    if _emitter['thread'] is None:
+        with _emitter['lock']:
+            if _emitter['thread'] is None:
+                thread = threading.Thread(target=emit_loop, name='log-emitter', daemon=True)
+                thread.start()
+                _emitter['thread'] = thread
+
+
+def last_sequence():
+    """Sequence of the newest record (ETag / cursor for /api/logs)"""
+    return _last_sequence
+
+
+def query_logs(level=None, stage=None, feed=None, since=0, limit=None, until=None):
+    """Records newer than cursor `since` (up to cursor `until`), oldest first, optionally filtered"""
+    newest = _last_sequence if until is None else min(until, _last_sequence)
+    if since >= newest:
+        return []   # nothing new (or a cursor from before a restart: tail from the current cursor)
+    oldest = max(since + 1, newest - LOG_BUFFER_SIZE + 1, 1)
+    min_level = LEVELS[level.upper()] if level else None
+
+    records = []
+    for seq in range(oldest, newest + 1):
+        record = _ring[seq % LOG_BUFFER_SIZE]
+        if record is None or record['seq'] != seq:
+            continue    # overwritten by a newer record
+        if min_level is not None and LEVELS[record['level']] < min_level:
+            continue
+        if stage and record['stage'] != stage:
+            continue
+        if feed and record['feed'] != feed:
+            continue
+        records.append(record)
+
+    if limit is not None:
+        records = records[-limit:]
+    return records
+
+
+def get_logs(limit=50):
+    """Newest formatted lines (INFO and above) for the dashboard"""
+    return [format_record(record) for record in query_logs(level='INFO', limit=limit)]
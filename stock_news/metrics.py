@@ -0,0 +1,180 @@
+"""
+In-process metrics with Prometheus text exposition (served on /metrics)
+
+Counters and histograms are plain lists behind one short lock per metric, so
+observing costs a bisect and two additions; cheap enough to leave on for every
+article and request. Gauges are read from callbacks at scrape time.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Seconds; covers per-article stages (tens of µs) up to whole refreshes
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = (1, 5, 10, 20, 50, 100, 200, 500)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+registry = []
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value):
+    if value != value:
+        return 'NaN'
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        registry.append(self)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self._values = {}
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+                                for labels, value in values]
+
+
+class Gauge(Metric):
+    """Value(s) read at scrape time: callback() -> number or {label tuple: number}"""
+    kind = 'gauge'
+
+    def __init__(self, name, help_text, callback, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self.callback = callback
+
+    def render(self):
+        try:
+            values = self.callback()
+        except Exception:
+            return []
+        if not isinstance(values, dict):
+            values = {(): values}
+        return self.header() + [f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+                                for labels, value in sorted(values.items())]
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}   # labels -> [bucket counts..., sum, count]
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, *labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def render(self):
+        with self._lock:
+            series_items = sorted((labels, list(series)) for labels, series in self._series.items())
+
+        lines = self.header()
+        for labels, series in series_items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, [('le', _number(float(bound)))])} {cumulative}")
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, [('le', '+Inf')])} {series[-1]}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(series[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {series[-1]}")
+        return lines
+
+
+def render():
+    """Every registered metric in Prometheus text format"""
+    lines = []
+    for metric in registry:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+# **PIPELINE**
+pipeline_stage_seconds = Histogram(
+    'stocknews_pipeline_stage_seconds',
+    'Time spent per ingestion stage (per feed for fetch/parse, per article for the rest)',
+    ('stage',))
+feed_fetch_seconds = Histogram(
+    'stocknews_feed_seconds', 'End-to-end processing time per feed', ('feed',))
+feed_entries = Histogram(
+    'stocknews_feed_entries', 'Feed entries processed per fetch', ('feed',), buckets=SIZE_BUCKETS)
+feed_articles_total = Counter(
+    'stocknews_feed_articles_total', 'Articles kept after filtering', ('feed',))
+feed_bytes_total = Counter(
+    'stocknews_feed_bytes_total', 'Bytes downloaded per feed', ('feed',))
+feed_errors_total = Counter(
+    'stocknews_feed_errors_total', 'Failed feed fetches', ('feed',))
+
+# **HTTP**
+request_seconds = Histogram(
+    'stocknews_request_seconds', 'Request latency per route', ('route', 'method', 'status'))
+
+
+def init_app(app):
+    """Time every request, labelled by URL rule (not raw path, to bound cardinality)"""
+    from flask import g, request
+
+    @app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def record_latency(response):
+        started = g.pop('request_started', None)
+        if started is not None:
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            request_seconds.observe(time.perf_counter() - started, route, request.method, str(response.status_code))
+        return response
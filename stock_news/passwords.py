@@ -0,0 +1,121 @@
+"""
+Password hashing off the request threads
+
+scrypt is deliberately CPU-bound, so hashes are computed in a small process
+pool (one worker per core by default) instead of on waitress threads; the
+'login' admission limit in admission.py bounds how many requests wait on it.
+The cost is configurable, and hashes made with other parameters are upgraded
+on the next successful login (see users.verify_user).
+
+Workers come from a forkserver (spawn where that's unavailable), never from a
+plain fork of the server: by then the log emitter, flusher and scheduler
+threads are running, and forking a process with threads can deadlock the
+child. Either way each worker re-imports the parent's main module as
+__mp_main__, which is why the entry points (app.py, hello.py, python.py)
+build nothing at import. A hash that doesn't finish within HASH_TIMEOUT raises Overloaded, so
+/login and /register answer 503 with Retry-After instead of 500.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from .admission import Overloaded
+from .logs import add_log, WARNING
+
+PASSWORD_METHOD = 'scrypt:32768:8:1'    # werkzeug method string: scrypt:N:r:p or pbkdf2:sha256:iterations
+PASSWORD_METHOD_ENV = 'STOCK_NEWS_PASSWORD_METHOD'
+HASH_WORKERS_ENV = 'STOCK_NEWS_HASH_WORKERS'
+HASH_TIMEOUT = 10                       # seconds to wait for one hash
+
+hasher = {
+    'pool': None,
+    'workers': None,
+    'method': None,
+    'prefix': None,     # method as written into hashes ('pbkdf2:sha256' -> 'pbkdf2:sha256:1000000')
+    'inline': False,    # pool unavailable: hash on the calling thread
+    'lock': threading.Lock()
+}
+
+def configure(method=None, workers=None):
+    """Set the hash method and pool size ($STOCK_NEWS_PASSWORD_METHOD / $STOCK_NEWS_HASH_WORKERS win)"""
+    with hasher['lock']:
+        if hasher['pool'] is not None:
+            hasher['pool'].shutdown(wait=False)
+        hasher['pool'] = None
+        hasher['inline'] = False
+        hasher['method'] = os.environ.get(PASSWORD_METHOD_ENV) or method or PASSWORD_METHOD
+        hasher['workers'] = int(os.environ.get(HASH_WORKERS_ENV) or workers or os.cpu_count() or 1)
+        hasher['prefix'] = None
+
+def pool_context():
+    """forkserver with werkzeug's hashing preloaded, else spawn (both still re-import __main__)"""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(['werkzeug.security'])
+        return context
+    return multiprocessing.get_context('spawn')
+
+def get_pool():
+    """The hashing pool, started (all workers forked) on first use; None when running inline"""
+    if hasher['method'] is None:
+        configure()
+    if hasher['pool'] is None and not hasher['inline']:
+        with hasher['lock']:
+            if hasher['pool'] is None and not hasher['inline']:
+                try:
+                    pool = ProcessPoolExecutor(max_workers=hasher['workers'], mp_context=pool_context())
+                    for future in [pool.submit(os.getpid) for _ in range(hasher['workers'])]:
+                        future.result(timeout=HASH_TIMEOUT)
+                    hasher['pool'] = pool
+                except Exception as e:
+                    hasher['inline'] = True
+                    add_log(f"⚠️ Password hashing pool unavailable, hashing inline: {e}", WARNING, stage='auth')
+    return hasher['pool']
+
+def discard_pool(pool):
+    """Drop a broken pool; only the first caller to see it broken shuts it down"""
+    with hasher['lock']:
+        if hasher['pool'] is not pool:
+            return      # another request already replaced it
+        hasher['pool'] = None
+    pool.shutdown(wait=False, cancel_futures=True)
+    add_log("⚠️ Password hashing pool broke; restarting it", WARNING, stage='auth')
+
+def run_hash(function, *args):
+    for _ in range(2):      # a broken pool is replaced once, then we hash inline
+        pool = get_pool()
+        if pool is None:
+            break
+        future = None
+        try:
+            future = pool.submit(function, *args)
+            return future.result(timeout=HASH_TIMEOUT)
+        except BrokenProcessPool:
+            discard_pool(pool)
+        except TimeoutError:
+            future.cancel()
+            add_log(f"⚠️ Password hash took over {HASH_TIMEOUT}s; rejecting the request", WARNING, stage='auth')
+            raise Overloaded('login', 'hash_timeout', HASH_TIMEOUT)
+    return function(*args)
+
+def hash_password(password):
+    if hasher['method'] is None:
+        configure()
+    return run_hash(generate_password_hash, password, hasher['method'])
+
+def check_password(password_hash, password):
+    return run_hash(check_password_hash, password_hash, password)
+
+def method_prefix():
+    """Parameters part of a hash made with the configured method"""
+    if hasher['prefix'] is None:
+        hasher['prefix'] = hash_password('').split('$', 1)[0]
+    return hasher['prefix']
+
+def needs_rehash(password_hash):
+    """True when password_hash was made with other parameters than the configured ones"""
+    return password_hash.split('$', 1)[0] != method_prefix()
@@ -0,0 +1,273 @@
+"""
+Stock quotes
+
+Quotes come from a pluggable provider ($STOCK_NEWS_PRICE_PROVIDER: demo, file
+or http) that answers a whole batch of symbols per call. Every request goes
+through one shared QuoteCache: quotes are reused for QUOTE_TTL seconds, the
+symbols it has never quoted are fetched in a single provider call, and a
+symbol already being fetched for another request is waited on rather than
+fetched again. Quotes expire together at the end of each window; the first
+request to see that gets the expired quotes back at once and starts one
+background call refreshing every recently used symbol, so no request waits
+on the global refresh. A watchlist of 100 stocks costs at most one upstream
+call per cache window, and in steady state all users together cost about one.
+When the provider fails, the last known quote is served (marked stale once
+it is more than a window old) instead of nothing.
+"""
+import os
+import random
+import threading
+import time
+from urllib.parse import quote
+
+from . import http_client, json_provider
+from .logs import add_log, WARNING
+from .metrics import Counter, Histogram
+from .storage import read_json_file
+
+QUOTE_TTL = 15          # seconds a quote is served from the cache
+STALE_TTL = 15 * 60     # how long the last quote may stand in while the provider fails
+FETCH_WAIT = 10         # seconds to wait on another request's fetch
+MAX_BATCH = 200         # symbols per upstream request (http provider)
+
+PRICE_PROVIDER_ENV = 'STOCK_NEWS_PRICE_PROVIDER'
+PRICE_FILE_ENV = 'STOCK_NEWS_PRICE_FILE'
+PRICE_URL_ENV = 'STOCK_NEWS_PRICE_URL'
+PRICES_FILE = 'user_data/prices.json'
+DEFAULT_PROVIDER = 'demo'
+
+quotes_total = Counter('stocknews_quotes_total', 'Quotes served by source', ('source',))
+quote_fetch_seconds = Histogram('stocknews_quote_fetch_seconds', 'Time for one provider batch', ('provider',))
+
+
+def make_quote(symbol, price, change, status):
+    """The quote fields merged into watchlist rows"""
+    price, change = float(price), float(change)
+    previous = price - change
+    return {
+        'symbol': symbol,
+        'price': round(price, 2),
+        'change': round(change, 2),
+        'percent_change': round(change / previous * 100, 2) if previous else 0.0,
+        'status': status
+    }
+
+def unavailable_quote(symbol):
+    return {'symbol': symbol, 'price': None, 'change': None, 'percent_change': None, 'status': 'unavailable'}
+
+
+# **PROVIDERS**
+class DemoProvider:
+    """Random demo numbers (what get_stock_price always returned)"""
+    name = 'demo'
+
+    def get_quotes(self, symbols):
+        quotes = {}
+        for symbol in symbols:
+            price = random.uniform(100, 5000)
+            quotes[symbol] = make_quote(symbol, price, random.uniform(-50, 50), 'demo_data')
+        return quotes
+
+class FileProvider:
+    """
+    Quotes from a JSON file, {"TCS": {"price": 3900.5, "change": -12.3}, ...}
+    ($STOCK_NEWS_PRICE_FILE, default user_data/prices.json), re-read when it
+    changes. A local stand-in for a market data feed.
+    """
+    name = 'file'
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get(PRICE_FILE_ENV) or PRICES_FILE
+        self.mtime = None
+        self.prices = {}
+        self.lock = threading.Lock()
+
+    def load(self):
+        mtime = os.stat(self.path).st_mtime
+        with self.lock:
+            if mtime != self.mtime:
+                self.prices = read_json_file(self.path)
+                self.mtime = mtime
+            return self.prices
+
+    def get_quotes(self, symbols):
+        prices = self.load()
+        return {symbol: make_quote(symbol, prices[symbol]['price'], prices[symbol].get('change', 0), 'file')
+                for symbol in symbols if symbol in prices}
+
+class HttpProvider:
+    """
+    GET $STOCK_NEWS_PRICE_URL?symbols=TCS,INFY,... answering the same JSON as
+    the file provider (optionally wrapped in {"quotes": ...}); up to MAX_BATCH
+    symbols per request.
+    """
+    name = 'http'
+
+    def __init__(self, url=None):
+        self.url = url or os.environ[PRICE_URL_ENV]
+
+    def get_quotes(self, symbols):
+        quotes = {}
+        for start in range(0, len(symbols), MAX_BATCH):
+            batch = symbols[start:start + MAX_BATCH]
+            separator = '&' if '?' in self.url else '?'
+            response = http_client.get(f"{self.url}{separator}symbols={quote(','.join(batch), safe=',')}",
+                                       headers={'Accept': 'application/json'})
+            if response.status_code >= 400:
+                raise Exception(f"price provider HTTP {response.status_code}")
+            prices = json_provider.loads(response.content)
+            prices = prices.get('quotes', prices)
+            for symbol in batch:
+                if symbol in prices:
+                    quotes[symbol] = make_quote(symbol, prices[symbol]['price'],
+                                                prices[symbol].get('change', 0), 'live')
+        return quotes
+
+PROVIDERS = {
+    'demo': DemoProvider,
+    'file': FileProvider,
+    'http': HttpProvider,
+}
+
+
+# **QUOTE CACHE**
+class Fetch:
+    """One in-flight provider call that other requests can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.quotes = {}
+
+class QuoteCache:
+    """Shared TTL cache in front of a provider, coalescing concurrent fetches"""
+
+    def __init__(self, provider, ttl=QUOTE_TTL):
+        self.provider = provider
+        self.ttl = ttl
+        self.quotes = {}        # symbol -> (fetched_at, quote)
+        self.fetching = {}      # symbol -> Fetch
+        self.upstream_calls = 0
+        self.lock = threading.Lock()
+
+    def fresh(self, fetched_at, now):
+        """Quotes expire together at the end of their TTL window, so refreshes line up"""
+        return fetched_at // self.ttl == now // self.ttl
+
+    def get_quotes(self, symbols):
+        """
+        {symbol: quote} for every symbol asked for (unavailable_quote when there
+        is none). Only symbols with no quote at all are fetched inline; expired
+        quotes are served as they are while one background call refreshes
+        every expired symbol.
+        """
+        results, waits, missing, expired = {}, [], [], None
+        now = time.time()
+        with self.lock:
+            for symbol in dict.fromkeys(symbols):
+                cached = self.quotes.get(symbol)
+                if cached is not None and now - cached[0] < STALE_TTL:
+                    fetched_at, results[symbol] = cached
+                    if not self.fresh(fetched_at, now):
+                        expired = True
+                        # More than a window behind means the refresh is failing: say so
+                        if now - fetched_at >= 2 * self.ttl:
+                            results[symbol] = dict(results[symbol], stale=True)
+                elif symbol in self.fetching:
+                    waits.append((symbol, self.fetching[symbol]))
+                else:
+                    missing.append(symbol)
+            if expired:
+                expired = self.claim_expired(now)
+            if missing:
+                fetch = Fetch()
+                for symbol in missing:
+                    self.fetching[symbol] = fetch
+        quotes_total.inc('cache', amount=len(results))
+
+        if expired:
+            threading.Thread(target=self.fetch, args=expired, name='quote-refresh', daemon=True).start()
+        if missing:
+            results.update(self.fetch(missing, fetch))
+        for symbol, other in waits:
+            other.done.wait(FETCH_WAIT)
+            if symbol in other.quotes:
+                results[symbol] = other.quotes[symbol]
+                quotes_total.inc('coalesced')
+            else:
+                results[symbol] = self.stale_quote(symbol)
+        return results
+
+    def claim_expired(self, now):
+        """
+        (symbols, Fetch) for every recently used symbol past its window and not
+        already being fetched, so one background call refreshes them all;
+        quotes older than STALE_TTL are dropped. Called under self.lock.
+        """
+        symbols = []
+        for symbol, (fetched_at, _) in list(self.quotes.items()):
+            if now - fetched_at >= STALE_TTL:
+                del self.quotes[symbol]
+            elif symbol not in self.fetching and not self.fresh(fetched_at, now):
+                symbols.append(symbol)
+        if not symbols:
+            return None
+        fetch = Fetch()
+        for symbol in symbols:
+            self.fetching[symbol] = fetch
+        return symbols, fetch
+
+    def fetch(self, symbols, fetch):
+        """One provider call for symbols; always releases the waiters"""
+        started = time.perf_counter()
+        try:
+            quotes = self.provider.get_quotes(symbols)
+            # Symbols the provider has no quote for are remembered too, so they aren't asked for every request
+            fetch.quotes = {symbol: quotes.get(symbol) or unavailable_quote(symbol) for symbol in symbols}
+        except Exception as e:
+            add_log(f"⚠️ Price provider '{self.provider.name}' failed for {len(symbols)} symbols: {e}",
+                    WARNING, stage='prices')
+        finally:
+            quote_fetch_seconds.observe(time.perf_counter() - started, self.provider.name)
+            fetched_at = time.time()
+            with self.lock:
+                self.upstream_calls += 1
+                for symbol in symbols:
+                    del self.fetching[symbol]
+                    if symbol in fetch.quotes:
+                        self.quotes[symbol] = (fetched_at, fetch.quotes[symbol])
+            fetch.done.set()
+
+        quotes_total.inc('provider', amount=len(fetch.quotes))
+        return {symbol: fetch.quotes[symbol] if symbol in fetch.quotes else self.stale_quote(symbol)
+                for symbol in symbols}
+
+    def stale_quote(self, symbol):
+        """The last quote while it is younger than STALE_TTL, marked stale; else unavailable"""
+        cached = self.quotes.get(symbol)
+        if cached is not None and cached[1]['price'] is not None and time.time() - cached[0] < STALE_TTL:
+            quotes_total.inc('stale')
+            return dict(cached[1], stale=True)
+        quotes_total.inc('unavailable')
+        return unavailable_quote(symbol)
+
+    def stats(self):
+        with self.lock:
+            return {'provider': self.provider.name, 'ttl': self.ttl, 'cached': len(self.quotes),
+                    'fetching': len(self.fetching), 'upstream_calls': self.upstream_calls}
+
+price_state = {'cache': None, 'lock': threading.Lock()}
+
+def get_quote_cache():
+    """The process-wide cache over the configured provider (built on first use)"""
+    if price_state['cache'] is None:
+        with price_state['lock']:
+            if price_state['cache'] is None:
+                name = os.environ.get(PRICE_PROVIDER_ENV) or DEFAULT_PROVIDER
+                price_state['cache'] = QuoteCache(PROVIDERS[name]())
+    return price_state['cache']
+
+def get_quotes(symbols):
+    return get_quote_cache().get_quotes(list(symbols))
+
+def get_stock_price(symbol):
+    return get_quotes([symbol])[symbol]
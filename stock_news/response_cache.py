@@ -0,0 +1,101 @@
+"""
+Bounded cache of snapshot-derived responses, precompressed once per generation
+
+Entries keep the identity body plus gzip (and brotli, when installed) variants,
+so serving a compressed response costs a dict lookup instead of per-request
+compression.
+"""
+import gzip
+import threading
+from collections import OrderedDict
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MAX_ENTRIES = 256
+MIN_COMPRESS_SIZE = 512     # smaller bodies are not worth compressing
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+class CompressedEntry:
+    """One response body with its precompressed variants"""
+
+    __slots__ = ('generation', 'mimetype', 'variants')
+
+    def __init__(self, generation, body, mimetype):
+        self.generation = generation
+        self.mimetype = mimetype
+        self.variants = {None: body}
+
+        if len(body) >= MIN_COMPRESS_SIZE:
+            if brotli is not None:
+                self.variants['br'] = brotli.compress(body, quality=BROTLI_QUALITY)
+            self.variants['gzip'] = gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+    def encodings(self):
+        """Available content-codings, preferred first"""
+        return [encoding for encoding in ('br', 'gzip') if encoding in self.variants]
+
+    def body(self, encoding=None):
+        return self.variants.get(encoding, self.variants[None])
+
+
+class CompressedResponseCache:
+    """Thread-safe LRU of CompressedEntry objects"""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, generation, body, mimetype):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        entry = CompressedEntry(generation, body, mimetype)
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def get_or_build(self, key, generation, build):
+        """Cached entry for key, or build() -> (body, mimetype) once and cache it"""
+        entry = self.get(key)
+        if entry is None:
+            body, mimetype = build()
+            entry = self.put(key, generation, body, mimetype)
+        return entry
+
+    def purge_before(self, generation):
+        """Drop entries built from older snapshot generations"""
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry.generation < generation]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': sum(len(v) for e in self._entries.values() for v in e.variants.values()),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
@@ -0,0 +1,655 @@
+"""
+HTTP routes, registered on the app by create_app()
+"""
+from datetime import datetime
+from functools import wraps
+
+from flask import (Blueprint, Response, abort, flash, jsonify, redirect, render_template, request,
+                   session, stream_with_context, url_for)
+
+from . import admission, alerts, feed_scheduler, json_provider, logs, metrics, sse_server
+from .admission import Overloaded, admit
+from .analysis import extract_stocks_from_headline, enhanced_sentiment_analysis
+from .companies import COMPANY_SECTORS
+from .conditional import make_etag, not_modified_response, with_etag, compressed_response
+from .config import CACHE_DURATION, settings
+from .logs import add_log, event_broadcaster, WARNING, ERROR
+from .prices import get_quotes
+from .snapshot import (news_cache, response_cache, get_news_snapshot, current_generation,
+                       ensure_news_refresher, build_dashboard_payload, get_watchlist_view, deltas_since,
+                       ARTICLE_FIELDS)
+from .search import search_stocks
+from .summarizers import SUMMARIZERS
+from .users import create_user, verify_user, is_admin
+from .warmup import app_state
+from .watchlists import (load_user_watchlist, edit_watchlist, get_watchlist_version, apply_bulk_changes,
+                         parse_holdings_csv, MAX_BULK_SYMBOLS)
+from . import http_client
+
+bp = Blueprint('main', __name__)
+
+SSE_HEARTBEAT = 15  # seconds between keep-alive comments on /api/stream
+
+# **ADMISSION CONTROL**
+def client_key():
+    """Rate-limit key: the logged-in user, else the client address"""
+    return session.get('user_id') or request.remote_addr
+
+def login_key(username):
+    """
+    Rate-limit key for /login and /register: the submitted username. Behind a
+    load balancer every client has the same remote_addr, so keying on it would
+    put all sign-ins in one bucket; total load is bounded by the 'login' slots.
+    """
+    return f"login:{username}"
+
+def login_required(view):
+    """JSON 401 for API views when nobody is logged in"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if 'user_id' not in session:
+            return jsonify({'error': 'Authentication required'}), 401
+        return view(*args, **kwargs)
+    return wrapper
+
+def admin_required(view):
+    """JSON 401/403 unless the logged-in user is an admin ($STOCK_NEWS_ADMINS)"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if 'user_id' not in session:
+            return jsonify({'error': 'Authentication required'}), 401
+        if not is_admin(session.get('username')):
+            return jsonify({'error': 'Admin access required'}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+def admission_controlled(endpoint):
+    """Run the whole view under admit(endpoint, client_key())"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            with admit(endpoint, client_key()):
+                return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+@bp.errorhandler(Overloaded)
+def overloaded(e):
+    return (jsonify({'error': 'Server busy, retry later' if e.status_code == 503 else 'Too many requests',
+                     'reason': e.reason}),
+            e.status_code, {'Retry-After': str(e.retry_after)})
+
+def busy_form(template, e):
+    """Re-render a form page with a flash message for an Overloaded rejection"""
+    flash(f"Too many sign-in attempts right now, please retry in {e.retry_after}s", 'error')
+    return render_template(template), e.status_code, {'Retry-After': str(e.retry_after)}
+
+# **AUTHENTICATION ROUTES**
+@bp.route('/login', methods=['GET', 'POST'])
+def login():
+    if request.method == 'POST':
+        username = request.form['username']
+        password = request.form['password']
+        
+        try:
+            with admit('login', login_key(username)):
+                success, result = verify_user(username, password)
+        except Overloaded as e:
+            return busy_form('login.html', e)
+        if success:
+            session['user_id'] = result['id']
+            session['username'] = username
+            flash('Login successful!', 'success')
+            return redirect(url_for('.dashboard'))
+        else:
+            flash(result, 'error')
+    
+    return render_template('login.html')
+
+@bp.route('/register', methods=['GET', 'POST'])
+def register():
+    if request.method == 'POST':
+        username = request.form['username']
+        password = request.form['password']
+        email = request.form['email']
+        
+        try:
+            with admit('login', login_key(username)):
+                success, message = create_user(username, password, email)
+        except Overloaded as e:
+            return busy_form('register.html', e)
+        if success:
+            flash(message, 'success')
+            return redirect(url_for('.login'))
+        else:
+            flash(message, 'error')
+    
+    return render_template('register.html')
+
+@bp.route('/logout')
+def logout():
+    session.clear()
+    flash('Logged out successfully', 'info')
+    return redirect(url_for('.login'))
+
+# **WATCHLIST ROUTES**
+@bp.route('/watchlist')
+def watchlist_page():
+    if 'user_id' not in session:
+        return redirect(url_for('.login'))
+    
+    try:
+        username = session.get('username', 'Guest')
+        user_id = session['user_id']
+        
+        generation = current_generation()
+        if generation is not None:
+            cached = not_modified_response(make_etag('watchlist', user_id, generation, get_watchlist_version(user_id)))
+            if cached:
+                return cached
+        
+        version = get_watchlist_version(user_id)    # read before the watchlist: never newer than it
+        watchlist = load_user_watchlist(user_id)
+        
+        snapshot = get_news_snapshot()
+        
+        # Only the watched symbols' gainers/losers, memoized per (generation, watchlist version)
+        if watchlist and snapshot['sector_articles']:
+            watchlist_sector_data = get_watchlist_view(snapshot, watchlist, version)
+        else:
+            watchlist_sector_data = {}
+        
+        html = render_template('watchlist.html', 
+                              username=username,
+                              watchlist_count=len(watchlist),
+                              watchlist_sector_data=watchlist_sector_data)
+        return with_etag(html, make_etag('watchlist', user_id, snapshot['generation'], version))
+    
+    except Exception as e:
+        add_log(f"❌ Watchlist error: {str(e)}", ERROR, stage='http')
+        return f"<h1>Error: {e}</h1>", 500
+
+@bp.route('/api/search_stocks')
+def api_search_stocks():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Authentication required'}), 401
+    
+    query = request.args.get('q', '')
+    if len(query) < 2:
+        return jsonify({'results': []})
+    
+    results = search_stocks(query)
+    return jsonify({'results': results})
+
+@bp.route('/api/add_to_watchlist', methods=['POST'])
+def api_add_to_watchlist():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Authentication required'}), 401
+    
+    try:
+        data = request.get_json()
+        symbol = data.get('symbol', '').upper()
+        name = data.get('name', '')
+        sector = data.get('sector', '')
+        
+        if not symbol:
+            return jsonify({'error': 'Symbol is required'}), 400
+        
+        user_id = session['user_id']
+        with edit_watchlist(user_id) as watchlist:
+            if not watchlist.add(symbol, name, sector):
+                return jsonify({'error': f'{symbol} already in watchlist'}), 400
+        
+        return jsonify({
+            'success': True, 
+            'message': f'{symbol} added to watchlist',
+            'total_stocks': len(watchlist)
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/remove_from_watchlist', methods=['POST'])
+def api_remove_from_watchlist():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Authentication required'}), 401
+    
+    try:
+        data = request.get_json()
+        symbol = data.get('symbol', '').upper()
+        
+        if not symbol:
+            return jsonify({'error': 'Symbol is required'}), 400
+        
+        user_id = session['user_id']
+        with edit_watchlist(user_id) as watchlist:
+            removed = watchlist.remove(symbol)
+        
+        if removed:
+            return jsonify({
+                'success': True, 
+                'message': f'{symbol} removed',
+                'total_stocks': len(watchlist)
+            })
+        else:
+            return jsonify({'error': f'{symbol} not found'}), 404
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/watchlist/bulk', methods=['POST'])
+def api_bulk_watchlist():
+    """Add and/or remove many symbols at once: {"add": [...], "remove": [...]}"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Authentication required'}), 401
+    
+    data = request.get_json(silent=True) or {}
+    add = data.get('add') or []
+    remove = data.get('remove') or []
+    if not isinstance(add, list) or not isinstance(remove, list) or not all(
+            isinstance(symbol, str) for symbol in add + remove):
+        return jsonify({'error': '"add" and "remove" must be lists of symbols'}), 400
+    if not add and not remove:
+        return jsonify({'error': 'No symbols given'}), 400
+    if len(add) + len(remove) > MAX_BULK_SYMBOLS:
+        return jsonify({'error': f'At most {MAX_BULK_SYMBOLS} symbols per request'}), 400
+    
+    report = apply_bulk_changes(session['user_id'], add, remove)
+    return jsonify({'success': True, **report})
+
+@bp.route('/api/watchlist/import', methods=['POST'])
+def api_import_watchlist():
+    """Add every holding from a broker CSV export (multipart field "file", or a text/csv body)"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Authentication required'}), 401
+    
+    upload = request.files.get('file')
+    raw = upload.read() if upload else request.get_data()
+    try:
+        text = raw.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return jsonify({'error': 'CSV must be UTF-8 text'}), 400
+    
+    symbols = parse_holdings_csv(text)
+    if not symbols:
+        return jsonify({'error': 'No symbols found in the CSV'}), 400
+    if len(symbols) > MAX_BULK_SYMBOLS:
+        return jsonify({'error': f'At most {MAX_BULK_SYMBOLS} holdings per import'}), 400
+    
+    report = apply_bulk_changes(session['user_id'], add=symbols)
+    return jsonify({'success': True, **report})
+
+@bp.route('/api/alerts/rules', methods=['GET', 'POST'])
+def api_alert_rules():
+    """The user's alert rule; POST a partial rule to change it (missing fields take defaults)"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Authentication required'}), 401
+    
+    user_id = session['user_id']
+    if request.method == 'POST':
+        rule, error = alerts.validate_rule(request.get_json(silent=True))
+        if error:
+            return jsonify({'error': error}), 400
+        alerts.save_rule(user_id, rule)
+    return jsonify({'rule': alerts.get_rule(user_id), 'sectors': COMPANY_SECTORS})
+
+@bp.route('/api/get_watchlist')
+def api_get_watchlist():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Authentication required'}), 401
+    
+    try:
+        user_id = session['user_id']
+        watchlist = load_user_watchlist(user_id)
+        
+        # One batched (cached, shared) quote lookup for the whole watchlist
+        quotes = get_quotes(watchlist.symbols())
+        watchlist_with_prices = [{**stock, **quotes[stock['symbol']]} for stock in watchlist]
+        
+        return jsonify({
+            'stocks': watchlist_with_prices,
+            'total_stocks': len(watchlist_with_prices),
+            'last_updated': datetime.now().isoformat(),
+            'username': session.get('username')
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# **MAIN DASHBOARD ROUTE**
+@bp.route("/")
+def dashboard():
+    if 'user_id' not in session:
+        return redirect(url_for('.login'))
+    
+    try:
+        user_id = session['user_id']
+        requested_sector = request.args.get('sector', '')
+        
+        # Answer revalidations before touching the snapshot or Jinja. The page holds nothing that
+        # changes within a generation: logs and "Last Updated" are filled in client-side
+        generation = current_generation()
+        if generation is not None:
+            cached = not_modified_response(
+                make_etag('dashboard', user_id, generation, get_watchlist_version(user_id), requested_sector))
+            if cached:
+                return cached
+        
+        # Cache miss: rendering (or a stale-snapshot fetch) is expensive, so it is admission-controlled
+        with admit('dashboard', client_key()):
+            snapshot = get_news_snapshot()
+            sector_articles = snapshot['sector_articles']
+            sector_data = snapshot['sector_data']
+        
+            # Only the active tab is rendered here; the rest load from /api/sector_pane
+            active_sector = request.args.get('sector')
+            if active_sector not in sector_data:
+                active_sector = next(iter(sector_data), None)
+        
+            total_articles = sum(len(articles) for articles in sector_articles.values())
+        
+            watchlist = load_user_watchlist(user_id)
+        
+            html = render_template(
+                "complete_dashboard.html",
+                sector_data=sector_data,
+                active_sector=active_sector,
+                total_articles=total_articles,
+                username=session.get('username'),
+                watchlist_count=len(watchlist),
+                generation=snapshot['generation'],
+                stream_url=sse_server.stream_url(request.host) or url_for('.api_stream')
+            )
+            return with_etag(html, make_etag('dashboard', user_id, snapshot['generation'],
+                                             get_watchlist_version(user_id), requested_sector))
+    except Overloaded:
+        raise
+    except Exception as e:
+        add_log(f"❌ Dashboard error: {str(e)}", ERROR, stage='http')
+        return f"<h1>Dashboard Error: {e}</h1><pre>{str(e)}</pre>", 500
+
+@bp.route("/api/sector_pane")
+def api_sector_pane():
+    """One sector tab's HTML; cacheable when requested for the current ?generation="""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Authentication required'}), 401
+    
+    sector = request.args.get('sector', '')
+    
+    generation = current_generation()
+    if generation is not None:
+        cached = not_modified_response(make_etag('sector_pane', sector, generation))
+        if cached:
+            return cached
+    
+    snapshot = get_news_snapshot()
+    data = (snapshot['sector_data'] or {}).get(sector)
+    if data is None:
+        return jsonify({'error': f'Unknown sector: {sector}'}), 404
+    
+    entry = response_cache.get_or_build(
+        ('sector_pane', snapshot['generation'], sector),
+        snapshot['generation'],
+        lambda: (render_template('sector_pane.html', sector=sector, data=data), 'text/html')
+    )
+    
+    headers = {'X-Snapshot-Generation': str(snapshot['generation'])}
+    if request.args.get('generation') == str(snapshot['generation']):
+        headers['Cache-Control'] = f'private, max-age={CACHE_DURATION}'
+    else:
+        headers['Cache-Control'] = 'no-cache'
+    return with_etag(compressed_response(entry, headers), make_etag('sector_pane', sector, snapshot['generation']))
+
+@bp.route("/api/dashboard")
+def api_dashboard():
+    """Normalized dashboard data; ?sectors=Banking,IT limits sectors, ?fields=title,url limits article fields"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Authentication required'}), 401
+    
+    sectors = [s.strip() for s in request.args.get('sectors', '').split(',') if s.strip()]
+    fields = [f.strip() for f in request.args.get('fields', '').split(',') if f.strip()]
+    
+    unknown_fields = [f for f in fields if f not in ARTICLE_FIELDS]
+    if unknown_fields:
+        return jsonify({'error': f"Unknown fields: {', '.join(unknown_fields)}",
+                        'allowed_fields': list(ARTICLE_FIELDS)}), 400
+    
+    etag_parts = ('api_dashboard', ','.join(sorted(set(sectors))), ','.join(fields))
+    generation = current_generation()
+    if generation is not None:
+        cached = not_modified_response(make_etag(*etag_parts, generation))
+        if cached:
+            return cached
+    
+    try:
+        snapshot = get_news_snapshot()
+        
+        def build():
+            payload = build_dashboard_payload(
+                snapshot['sector_data'] or {},
+                snapshot['generation'],
+                sectors=set(sectors) if sectors else None,
+                fields=tuple(fields) if fields else None
+            )
+            return json_provider.dumps_bytes(payload), 'application/json'
+        
+        entry = response_cache.get_or_build(etag_parts + (snapshot['generation'],), snapshot['generation'], build)
+        return with_etag(compressed_response(entry), make_etag(*etag_parts, snapshot['generation']))
+    except Exception as e:
+        add_log(f"❌ Dashboard API error: {str(e)}", ERROR, stage='http')
+        return jsonify({'error': str(e)}), 500
+
+@bp.route("/api/delta")
+@login_required
+def api_delta():
+    """
+    Snapshot deltas after ?since_generation=N for dashboards without a live
+    stream (the SSE 'delta' payloads, oldest first); "resync" when N is too old.
+    updated_at is when the snapshot was last confirmed fresh.
+    """
+    since = request.args.get('since_generation', type=int)
+    if since is None:
+        return jsonify({'error': 'since_generation is required'}), 400
+    
+    generation = news_cache['generation']
+    timestamp = news_cache['timestamp']
+    etag = make_etag('delta', since, generation, timestamp)
+    cached = not_modified_response(etag)
+    if cached:
+        return cached
+    
+    deltas = deltas_since(since)
+    return with_etag(jsonify({
+        'generation': generation,
+        'deltas': deltas or [],
+        'resync': deltas is None,
+        'updated_at': datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+    }), etag)
+
+@bp.route("/api/logs")
+def api_logs():
+    """
+    Recent log lines. Filters: ?level=WARNING (minimum), ?stage=fetch, ?feed=livemint,
+    ?since=<cursor> (only newer records), ?limit=N. Pass back `cursor` as ?since= to tail.
+    """
+    level = request.args.get('level', 'INFO').upper()
+    if level not in logs.LEVELS:
+        return jsonify({'error': f'Unknown level: {level}', 'levels': list(logs.LEVELS)}), 400
+    stage = request.args.get('stage') or None
+    feed = request.args.get('feed') or None
+    since = request.args.get('since', 0, type=int)
+    limit = max(1, min(request.args.get('limit', 50, type=int), logs.LOG_BUFFER_SIZE))
+    
+    cursor = logs.last_sequence()
+    etag = make_etag('logs', cursor, level, stage, feed, since, limit)
+    cached = not_modified_response(etag)
+    if cached:
+        return cached
+    
+    records = logs.query_logs(level=level, stage=stage, feed=feed, since=since, limit=limit, until=cursor)
+    return with_etag(jsonify({
+        "logs": [logs.format_record(record) for record in records],
+        "records": records,
+        "cursor": cursor
+    }), etag)
+
+@bp.route("/api/stream")
+def api_stream():
+    """
+    Server-Sent Events: pushes 'log' lines and 'snapshot' updates as they happen.
+    Each open stream holds a worker thread, so streams are capped (see events.py);
+    dashboards use the async server in sse_server.py when it runs, and past the
+    cap the 503 makes them tail /api/logs instead.
+    """
+    subscriber = event_broadcaster.subscribe(request.headers.get('Last-Event-ID'))
+    if subscriber is None:
+        return jsonify({'error': 'Too many live connections', 'poll': url_for('.api_logs')}), 503, {'Retry-After': '30'}
+    
+    ensure_news_refresher()
+    
+    def generate():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                frame = subscriber.get(timeout=SSE_HEARTBEAT)
+                yield frame if frame is not None else ": heartbeat\n\n"
+        finally:
+            event_broadcaster.unsubscribe(subscriber)
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@bp.route("/summarize")
+@admission_controlled('summarize')
+def summarize_url():
+    url = request.args.get("url")
+    if not url:
+        return jsonify({"summary": "No URL provided", "analysis_success": False})
+    
+    try:
+        # Extraction libraries are heavy; only this route needs them
+        import trafilatura
+        from newspaper import Article
+        
+        # One GET through the shared client (follows redirects); both extractors reuse the HTML
+        page = http_client.get(url)
+        resolved_url = page.url
+        html = page.text if page.ok else None
+        
+        article_content = None
+        extraction_method = "Simple"
+        
+        # Try newspaper3k first
+        if html:
+            try:
+                article = Article(resolved_url)
+                article.download(input_html=html)
+                article.parse()
+
+                if article.text and len(article.text.split()) >= 30:
+                    article_content = article.text
+                    extraction_method = "Newspaper3k"
+            except Exception as e:
+                add_log(f"Newspaper3k failed: {e}", WARNING, stage='summarize')
+        
+        # Fallback to trafilatura
+        if not article_content and html:
+            try:
+                article_content = trafilatura.extract(html)
+                if article_content:
+                    extraction_method = "Trafilatura"
+            except Exception as e:
+                add_log(f"Trafilatura failed: {e}", WARNING, stage='summarize')
+        
+        if not article_content or len(article_content.split()) < 30:
+            return jsonify({
+                "summary": "Could not extract enough article content for summarization",
+                "stock_mentions": [],
+                "sentiment": "Neutral",
+                "sentiment_score": "0.50",
+                "analysis_success": False
+            })
+        
+        max_chars = settings['max_article_chars']
+        if max_chars:
+            article_content = article_content[:max_chars]
+        
+        summary_result = SUMMARIZERS[settings['summarizer']](article_content, max_sentences=3)
+        add_log(f"✅ Summary created ({len(summary_result.split())} words, {settings['summarizer']})", stage='summarize')
+        
+        # Extract stock mentions from full article (not just summary)
+        stock_mentions = extract_stocks_from_headline(article_content[:500])
+        sentiment_label, sentiment_score = enhanced_sentiment_analysis(article_content[:1000], "")
+        
+        return jsonify({
+            "summary": summary_result,
+            "stock_mentions": stock_mentions[:6],
+            "sentiment": sentiment_label,
+            "sentiment_score": f"{sentiment_score:.2f}",
+            "word_count": len(article_content.split()),
+            "summary_length": len(summary_result.split()),
+            "extraction_method": extraction_method,
+            "analysis_success": True
+        })
+        
+    except Exception as e:
+        add_log(f"❌ Summarization error: {str(e)}", ERROR, stage='summarize')
+        return jsonify({
+            "summary": f"Error: {str(e)}",
+            "stock_mentions": [],
+            "sentiment": "Neutral",
+            "sentiment_score": "0.50",
+            "analysis_success": False
+        })
+
+@bp.route("/api/admission")
+def api_admission():
+    """Concurrency/queue/rate-limit counters per admission-controlled endpoint"""
+    return jsonify(admission.stats())
+
+@bp.route("/api/alerts")
+@login_required
+def api_alerts():
+    """Alert engine counters: outcomes, batches sent, queue depth"""
+    return jsonify(alerts.stats())
+
+@bp.route("/api/feeds")
+@admin_required
+def api_feeds():
+    """Per-feed health, latency percentiles, poll interval and breaker state"""
+    return jsonify(feed_scheduler.status())
+
+@bp.route("/admin/feeds")
+def feed_status_page():
+    if 'user_id' not in session:
+        return redirect(url_for('.login'))
+    if not is_admin(session.get('username')):
+        abort(403)
+    return render_template('feed_status.html', username=session.get('username'),
+                           status=feed_scheduler.status())
+
+@bp.route("/metrics")
+def metrics_endpoint():
+    """Prometheus scrape endpoint"""
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+
+# **HEALTH CHECKS**
+@bp.route("/healthz")
+def healthz():
+    """Liveness: the process is up and serving requests"""
+    return jsonify({'status': 'ok'})
+
+@bp.route("/readyz")
+def readyz():
+    """Readiness: warmup finished, snapshot loaded"""
+    body = {
+        'ready': app_state['ready'],
+        'profile': settings.get('name'),
+        'generation': news_cache['generation'],
+        'warmup': app_state['warmup']
+    }
+    return jsonify(body), (200 if app_state['ready'] else 503)
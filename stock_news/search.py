@@ -0,0 +1,222 @@
+"""
+Stock search index for /api/search_stocks autocomplete
+
+Built once from the company records:
+- exact: lower-cased symbol -> rows
+- prefix: sorted lower-cased symbols, bisected for a prefix range
+- names: character n-grams of lower-cased company names -> rows; a substring
+  query intersects its n-grams' posting sets and verifies the survivors
+
+Ranking is exact symbol, then symbol prefix, then name contains, each tier in
+company.csv order, capped at MAX_RESULTS.
+
+Only when all three come back empty ("relaince", "hdfcbnk") is the query
+treated as a typo: a padded-trigram index over symbols and names proposes the
+keys sharing the most trigrams with it, and those few candidates are re-ranked
+by a bounded edit distance (adjacent swaps count as one edit).
+"""
+import threading
+from bisect import bisect_left
+from collections import Counter
+from itertools import chain
+
+from .companies import COMPANY_RECORDS
+
+MAX_RESULTS = 15
+NGRAM = 3   # names are indexed by trigrams, plus bigrams for two-letter queries
+
+FUZZY_MIN_LENGTH = 3    # shorter queries are too ambiguous to correct
+FUZZY_CANDIDATES = 16   # keys re-ranked by edit distance, most shared trigrams first
+COMMON_GRAM_SHARE = 0.02    # trigrams on more of the keys than this (and COMMON_GRAM_KEYS) aren't counted
+COMMON_GRAM_KEYS = 256
+
+
+def ngrams(text, n):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+def padded_trigrams(text):
+    """Trigrams of '  text ', so the first letters weigh more (as in pg_trgm)"""
+    return ngrams(f'  {text} ', 3)
+
+def max_edits(query):
+    """Typos tolerated for a query of this length"""
+    if len(query) <= 4:
+        return 1
+    if len(query) <= 8:
+        return 2
+    return 3
+
+def prefix_distance(query, text, bound):
+    """
+    Fewest edits (insert, delete, substitute, swap adjacent) turning query into
+    some prefix of text, or bound + 1 once that is certain to exceed bound.
+    Only the diagonal band |i - j| <= bound of the table is filled.
+    """
+    text = text[:len(query) + bound]
+    size = len(text)
+    over = bound + 1
+    previous2, previous = None, [j if j <= bound else over for j in range(size + 1)]
+    last = None
+    for i, char in enumerate(query, 1):
+        current = [over] * (size + 1)
+        if i <= bound:
+            current[0] = i
+        low, high = max(1, i - bound), min(size, i + bound)
+        for j in range(low, high + 1):
+            other = text[j - 1]
+            distance = previous[j - 1] if char == other else previous[j - 1] + 1
+            if previous[j] + 1 < distance:
+                distance = previous[j] + 1
+            if current[j - 1] + 1 < distance:
+                distance = current[j - 1] + 1
+            if last == other and j > 1 and char == text[j - 2] and previous2[j - 2] + 1 < distance:
+                distance = previous2[j - 2] + 1
+            current[j] = distance
+        if min(current[low - 1:high + 1]) > bound:
+            return over
+        previous2, previous, last = previous, current, char
+    return min(min(previous), over)
+
+class SearchIndex:
+    """Immutable search structures over a list of company records"""
+
+    def __init__(self, records):
+        self.results = [{
+            'symbol': record.get('SYMBOL', 'N/A'),
+            'name': record.get('COMPANY_NAME', 'N/A'),
+            'sector': record.get('SECTOR', 'N/A'),
+            'industry': record.get('INDUSTRY', 'N/A')
+        } for record in records]
+        self.symbols = [record.get('SYMBOL', '').lower() for record in records]
+        self.names = [record.get('COMPANY_NAME', '').lower() for record in records]
+
+        self.exact = {}
+        for row, symbol in enumerate(self.symbols):
+            self.exact.setdefault(symbol, []).append(row)
+
+        ordered = sorted((symbol, row) for row, symbol in enumerate(self.symbols))
+        self.sorted_symbols = [symbol for symbol, _ in ordered]
+        self.sorted_rows = [row for _, row in ordered]
+
+        self.grams = {}
+        for row, name in enumerate(self.names):
+            for n in (2, NGRAM):
+                for gram in ngrams(name, n):
+                    self.grams.setdefault(gram, set()).add(row)
+
+        # Fuzzy keys: each symbol, each full name, and each later word of a name on
+        # its own ('finserve' -> Bajaj Finserv), indexed once per distinct text
+        self.fuzzy_keys = []    # (text, rows)
+        self.fuzzy_grams = {}
+        key_ids = {}
+        for row, (symbol, name) in enumerate(zip(self.symbols, self.names)):
+            for text in dict.fromkeys([symbol, name] + name.split()[1:]):
+                key = key_ids.get(text)
+                if key is None:
+                    key = key_ids[text] = len(self.fuzzy_keys)
+                    self.fuzzy_keys.append((text, []))
+                    for gram in padded_trigrams(text):
+                        self.fuzzy_grams.setdefault(gram, []).append(key)
+                self.fuzzy_keys[key][1].append(row)
+
+    def prefix_rows(self, prefix):
+        """Rows whose symbol starts with prefix, in row order"""
+        start = bisect_left(self.sorted_symbols, prefix)
+        end = bisect_left(self.sorted_symbols, prefix + '\uffff', start)
+        return sorted(self.sorted_rows[start:end])
+
+    def name_rows(self, text):
+        """Rows whose name contains text, in row order"""
+        if len(text) < 2:
+            return [row for row, name in enumerate(self.names) if text in name]
+
+        n = NGRAM if len(text) >= NGRAM else 2
+        postings = []
+        for gram in ngrams(text, n):
+            rows = self.grams.get(gram)
+            if not rows:
+                return []
+            postings.append(rows)
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        return sorted(row for row in candidates if text in self.names[row])
+
+    def fuzzy_rows(self, text, limit=MAX_RESULTS):
+        """
+        Up to limit rows within max_edits(text) of text (against the start of
+        a symbol, a name or a name's later word), closest first. Only keys
+        sharing trigrams with text are counted, and only the best
+        FUZZY_CANDIDATES of those long enough to match are aligned.
+        """
+        bound = max_edits(text)
+        grams = padded_trigrams(text)
+        postings = sorted((self.fuzzy_grams.get(gram, ()) for gram in grams), key=len)
+        # Trigrams on a large share of keys (think 'ban', 'ind') say little and cost the most to count
+        common = max(COMMON_GRAM_KEYS, int(len(self.fuzzy_keys) * COMMON_GRAM_SHARE))
+        counted = [keys for keys in postings if len(keys) <= common] or postings[:1]
+        shared = Counter(chain.from_iterable(counted))
+
+        # k edits destroy at most 3k trigrams, so anything sharing fewer can't be within bound
+        needed = max(1, len(grams) - 3 * bound - (len(postings) - len(counted)))
+        shortest = len(text) - bound     # a key shorter than this is more than bound edits away
+        matches = []
+        for key, count in shared.most_common(FUZZY_CANDIDATES):
+            if count < needed:
+                break
+            key_text, rows = self.fuzzy_keys[key]
+            if len(key_text) < shortest:
+                continue
+            distance = prefix_distance(text, key_text, bound)
+            if distance <= bound:
+                matches.append((distance, -count, key))
+
+        results, seen = [], set()
+        for _, _, key in sorted(matches):
+            for row in self.fuzzy_keys[key][1]:
+                if row not in seen:
+                    seen.add(row)
+                    results.append(row)
+                    if len(results) >= limit:
+                        return results
+        return results
+
+    def search(self, query, limit=MAX_RESULTS):
+        query_lower = query.lower().strip()
+        if not query_lower:
+            return []
+
+        results = []
+        seen_symbols = set()
+
+        def take(rows):
+            """Append unseen rows; True once the result list is full"""
+            for row in rows:
+                result = self.results[row]
+                if result['symbol'] not in seen_symbols:
+                    seen_symbols.add(result['symbol'])
+                    results.append(result)
+                    if len(results) >= limit:
+                        return True
+            return False
+
+        if take(self.exact.get(query_lower, ())):
+            return results
+        if take(row for row in self.prefix_rows(query_lower) if self.symbols[row] != query_lower):
+            return results
+        take(row for row in self.name_rows(query_lower) if not self.symbols[row].startswith(query_lower))
+        if not results and len(query_lower) >= FUZZY_MIN_LENGTH:
+            take(self.fuzzy_rows(query_lower, limit))
+        return results
+
+search_index = {'index': None, 'lock': threading.Lock()}
+
+def get_search_index():
+    """The index over COMPANY_RECORDS, built on first use (warmup builds it early)"""
+    if search_index['index'] is None:
+        with search_index['lock']:
+            if search_index['index'] is None:
+                search_index['index'] = SearchIndex(COMPANY_RECORDS)
+    return search_index['index']
+
+def search_stocks(query):
+    return get_search_index().search(query)
@@ -0,0 +1,455 @@
+"""
+The shared news snapshot: articles, precomputed gainers/losers and a generation
+counter that ETags, the response cache and SSE deltas key on
+"""
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from datetime import datetime
+
+from . import alerts, feed_scheduler, json_provider
+from .companies import VALID_INDIAN_SYMBOLS, SYMBOL_TO_SECTOR, COMPANY_SECTORS
+from .config import CACHE_DURATION
+from .ingestion import article_id
+from .logs import add_log, event_broadcaster, DEBUG, WARNING, ERROR
+from .metrics import Gauge, pipeline_stage_seconds
+from .response_cache import CompressedResponseCache
+from .storage import read_json_file, write_json_file
+
+# Global cache
+news_cache = {
+    'data': None,
+    'timestamp': None,
+    'sector_data': None,
+    'symbol_index': {},
+    'generation': 0,
+    'lock': threading.Lock()
+}
+
+# Snapshot-derived responses (sector tabs, dashboard JSON), precompressed per generation
+response_cache = CompressedResponseCache()
+
+DELTA_HISTORY = 20      # generations of deltas kept for /api/delta pollers
+
+# The latest generations' deltas, oldest first (same payload as the SSE 'delta' event)
+recent_deltas = deque(maxlen=DELTA_HISTORY)
+
+def get_news_snapshot():
+    """Current news snapshot (articles, gainers/losers, generation), refreshed when stale"""
+    with news_cache['lock']:
+        now = time.time()
+        
+        if (news_cache['data'] is not None and 
+            news_cache['timestamp'] is not None and 
+            (now - news_cache['timestamp']) < CACHE_DURATION):
+            add_log("📦 Using cached news data", DEBUG, stage='snapshot', sample=True)
+        else:
+            refresh_news_snapshot(now)
+        
+        return {
+            'sector_articles': news_cache['data'],
+            'sector_data': news_cache['sector_data'],
+            'symbol_index': news_cache['symbol_index'],
+            'generation': news_cache['generation'],
+            'timestamp': news_cache['timestamp']
+        }
+
+Gauge('stocknews_snapshot_generation', 'Current news snapshot generation', lambda: news_cache['generation'])
+Gauge('stocknews_snapshot_age_seconds', 'Seconds since the snapshot was fetched',
+      lambda: time.time() - news_cache['timestamp'] if news_cache['timestamp'] else float('nan'))
+Gauge('stocknews_response_cache', 'Precompressed response cache counters',
+      lambda: {(key,): value for key, value in response_cache.stats().items()}, ('stat',))
+
+news_refresher = {'thread': None, 'lock': threading.Lock()}
+
+def news_refresh_loop():
+    """
+    Poll feeds as they come due (see feed_scheduler) so live (SSE) clients get
+    deltas without reloading; a new generation is only built when articles changed
+    """
+    while True:
+        try:
+            changed = feed_scheduler.poll_feeds()
+            with news_cache['lock']:
+                now = time.time()
+                if changed:
+                    publish_merged_snapshot(now)
+                elif news_cache['data'] is not None:
+                    news_cache['timestamp'] = now   # every feed is on schedule: still fresh
+        except Exception as e:
+            add_log(f"❌ Background refresh error: {str(e)}", ERROR, stage='snapshot')
+        time.sleep(feed_scheduler.SCHEDULER_TICK)
+
+def ensure_news_refresher():
+    with news_refresher['lock']:
+        if news_refresher['thread'] is None:
+            news_refresher['thread'] = threading.Thread(target=news_refresh_loop, daemon=True)
+            news_refresher['thread'].start()
+
+def refresh_news_snapshot(now):
+    """Poll every feed not behind an open breaker, then publish (caller holds the lock)"""
+    add_log("🔄 Fetching fresh news data...", stage='snapshot')
+    with pipeline_stage_seconds.time('fetch_all_feeds'):
+        feed_scheduler.poll_feeds(now, due_only=False)
+    publish_merged_snapshot(now)
+
+def publish_merged_snapshot(now):
+    """Install every feed's last good articles as a new generation and persist them (caller holds the lock)"""
+    sector_articles = feed_scheduler.merged_articles()
+    add_log(f"✅ Total Indian market articles: {sum(len(v) for v in sector_articles.values())}", stage='snapshot')
+    install_news_snapshot(sector_articles, now)
+    with pipeline_stage_seconds.time('persist'):
+        save_news_snapshot(feed_scheduler.feed_articles(), now)
+
+def install_news_snapshot(sector_articles, now):
+    """Make sector_articles the current generation and push snapshot/delta events (caller holds the lock)"""
+    with pipeline_stage_seconds.time('build_gainers_losers'):
+        sector_data = build_gainers_losers(sector_articles)
+    
+    previous_data = news_cache['sector_data'] or {}
+    previous_urls = {art['url'] for articles in (news_cache['data'] or {}).values() for art in articles}
+    base_generation = news_cache['generation']
+    
+    news_cache['data'] = sector_articles
+    news_cache['sector_data'] = sector_data
+    news_cache['symbol_index'] = build_symbol_index(sector_data)
+    news_cache['timestamp'] = now
+    news_cache['generation'] += 1
+    response_cache.purge_before(news_cache['generation'])
+    
+    total_articles = sum(len(v) for v in sector_articles.values())
+    fresh_articles = [art for articles in sector_articles.values() for art in articles
+                      if art['url'] not in previous_urls]
+    new_articles = len(fresh_articles)
+    
+    # The first generation in a process has nothing to compare with: don't alert on all of it
+    if previous_urls:
+        alerts.submit(fresh_articles)
+    
+    event_broadcaster.publish('snapshot', json_provider.dumps({
+        'generation': news_cache['generation'],
+        'total_articles': total_articles,
+        'updated_at': datetime.fromtimestamp(now).isoformat()
+    }))
+    
+    sector_changes, removed_sectors = compute_snapshot_delta(previous_data, sector_data)
+    delta = {
+        'generation': news_cache['generation'],
+        'base_generation': base_generation,
+        'total_articles': total_articles,
+        'new_articles': new_articles,
+        'sectors': sector_changes,
+        'removed_sectors': removed_sectors
+    }
+    recent_deltas.append(delta)
+    event_broadcaster.publish('delta', json_provider.dumps(delta))
+    add_log(f"📡 Generation {news_cache['generation']}: {new_articles} new articles, {len(sector_changes)} sectors changed",
+            stage='snapshot')
+
+
+NEWS_SNAPSHOT_FILE = 'user_data/news_snapshot.json'
+
+class MemorySnapshotStore:
+    """Nothing survives a restart; each worker fetches its own first snapshot"""
+
+    def save(self, feed_articles, timestamp):
+        pass
+
+    def load(self):
+        return None
+
+class FileSnapshotStore:
+    """Latest articles on disk so a restarted worker can serve without fetching"""
+
+    def __init__(self, path=NEWS_SNAPSHOT_FILE):
+        self.path = path
+
+    def save(self, feed_articles, timestamp):
+        try:
+            tmp_path = self.path + '.tmp'
+            write_json_file(tmp_path, {'timestamp': timestamp, 'feeds': feed_articles})
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            add_log(f"⚠️ Could not persist news snapshot: {e}", WARNING, stage='snapshot')
+
+    def load(self):
+        try:
+            return read_json_file(self.path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            add_log(f"⚠️ Ignoring unreadable news snapshot: {e}", WARNING, stage='snapshot')
+            return None
+
+SNAPSHOT_STORES = {
+    'memory': MemorySnapshotStore,
+    'file': FileSnapshotStore,
+}
+
+snapshot_store = {'backend': MemorySnapshotStore()}
+
+def set_snapshot_store(name):
+    """Select the cache backend named by the active profile"""
+    snapshot_store['backend'] = SNAPSHOT_STORES[name]()
+
+def save_news_snapshot(feed_articles, timestamp):
+    """Persist per-feed articles (feed name -> sector -> articles)"""
+    snapshot_store['backend'].save(feed_articles, timestamp)
+
+def load_news_snapshot():
+    return snapshot_store['backend'].load()
+
+def load_or_fetch_snapshot():
+    """Restore a fresh persisted snapshot, otherwise do the first fetch now"""
+    saved = load_news_snapshot()
+    with news_cache['lock']:
+        if news_cache['data'] is not None:
+            return
+        if saved and (time.time() - saved['timestamp']) < CACHE_DURATION:
+            if 'feeds' in saved:
+                feed_scheduler.seed(saved['feeds'], saved['timestamp'])
+                sector_articles = feed_scheduler.merged_articles()
+            else:
+                sector_articles = saved['sector_articles']  # written before per-feed snapshots
+            install_news_snapshot(sector_articles, saved['timestamp'])
+            add_log("📦 Restored persisted news snapshot", stage='snapshot')
+        else:
+            refresh_news_snapshot(time.time())
+
+def current_generation():
+    """Generation of the cached snapshot if still fresh, else None (never fetches)"""
+    timestamp = news_cache['timestamp']
+    if news_cache['data'] is None or timestamp is None or (time.time() - timestamp) >= CACHE_DURATION:
+        return None
+    return news_cache['generation']
+
+def deltas_since(generation):
+    """
+    The deltas leading from generation to the current one, oldest first; None
+    when generation is outside the kept history (the client must reload)
+    """
+    deltas = list(recent_deltas)
+    if generation == news_cache['generation']:
+        return []
+    chain = [delta for delta in deltas if delta['generation'] > generation]
+    if not chain or chain[0]['base_generation'] != generation:
+        return None
+    return chain
+
+def build_gainers_losers(sector_articles):
+    """
+    Build gainers/losers for each sector
+    KEY FIX: Place stocks ONLY in their CSV-defined sector, not article sector
+    """
+    if not sector_articles:
+        return {}
+    
+    # Track all stock mentions across all articles
+    all_stock_mentions = defaultdict(lambda: {'positive': 0, 'negative': 0, 'articles': [], 'csv_sector': None})
+    
+    # Collect all stocks from all articles
+    for article_sector, articles in sector_articles.items():
+        for art in articles:
+            mentioned = art.get('stock_mentions', [])
+            sentiment = art.get('sentiment_label', 'Neutral')
+            
+            for symbol in mentioned:
+                if symbol in VALID_INDIAN_SYMBOLS:
+                    # Get CORRECT sector from CSV
+                    correct_sector = SYMBOL_TO_SECTOR.get(symbol, 'Unknown')
+                    
+                    if correct_sector != 'Unknown':
+                        all_stock_mentions[symbol]['csv_sector'] = correct_sector
+                        all_stock_mentions[symbol]['articles'].append(art)
+                        
+                        if sentiment == 'Positive':
+                            all_stock_mentions[symbol]['positive'] += 1
+                        elif sentiment == 'Negative':
+                            all_stock_mentions[symbol]['negative'] += 1
+    
+    # Now organize by CSV sector (not article sector)
+    result = {}
+    
+    for sector in COMPANY_SECTORS:
+        gainers = []
+        losers = []
+        
+        # Find stocks that belong to THIS sector (from CSV)
+        for symbol, data in all_stock_mentions.items():
+            if data['csv_sector'] == sector:
+                if data['positive'] > data['negative'] and data['positive'] >= 1:
+                    gainers.append({
+                        'symbol': symbol,
+                        'positive_count': data['positive'],
+                        'articles': data['articles'][:3]
+                    })
+                elif data['negative'] > data['positive'] and data['negative'] >= 1:
+                    losers.append({
+                        'symbol': symbol,
+                        'negative_count': data['negative'],
+                        'articles': data['articles'][:3]
+                    })
+        
+        # Sort
+        gainers = sorted(gainers, key=lambda x: x['positive_count'], reverse=True)[:10]
+        losers = sorted(losers, key=lambda x: x['negative_count'], reverse=True)[:10]
+        
+        # Get articles relevant to this sector
+        positive_articles = []
+        negative_articles = []
+        
+        for article_sector, articles in sector_articles.items():
+            for art in articles:
+                # Check if article mentions stocks from this sector
+                stock_mentions = art.get('stock_mentions', [])
+                has_sector_stock = any(
+                    SYMBOL_TO_SECTOR.get(s) == sector 
+                    for s in stock_mentions
+                )
+                
+                if has_sector_stock:
+                    if art['sentiment_label'] == 'Positive':
+                        positive_articles.append(art)
+                    elif art['sentiment_label'] == 'Negative':
+                        negative_articles.append(art)
+        
+        # Only include sector if it has gainers/losers or articles
+        if gainers or losers or positive_articles or negative_articles:
+            result[sector] = {
+                "gainers": gainers,
+                "losers": losers,
+                "positive": positive_articles[:10],
+                "negative": negative_articles[:10]
+            }
+    
+    add_log(f"✅ Built gainers/losers for {len(result)} sectors (CSV-based)", stage='snapshot')
+    return result
+
+def build_symbol_index(sector_data):
+    """
+    symbol -> (sector position, sector, 'gainers'/'losers', rank, entry) for
+    every gainer/loser, so per-user views read only the watched symbols
+    """
+    index = {}
+    for position, (sector, data) in enumerate(sector_data.items()):
+        for side in ('gainers', 'losers'):
+            for rank, entry in enumerate(data[side]):
+                index[entry['symbol']] = (position, sector, side, rank, entry)
+    return index
+
+WATCHLIST_VIEW_CACHE_SIZE = 1024
+
+# (generation, watchlist version) -> view; versions are unique per edit, so no user id needed
+watchlist_views = {'entries': OrderedDict(), 'hits': 0, 'misses': 0, 'lock': threading.Lock()}
+
+Gauge('stocknews_watchlist_view_cache', 'Per-user watchlist view LRU counters',
+      lambda: {('hits',): watchlist_views['hits'], ('misses',): watchlist_views['misses'],
+               ('entries',): len(watchlist_views['entries'])}, ('stat',))
+
+def build_watchlist_view(symbol_index, symbols):
+    """
+    The watched symbols' gainers/losers by sector, in the dashboard's sector
+    and rank order: {sector: {'gainers': [...], 'losers': [...]}}. Costs one
+    lookup per watched symbol.
+    """
+    hits = sorted((symbol_index[symbol] for symbol in symbols if symbol in symbol_index),
+                  key=lambda hit: hit[:4])
+    view = {}
+    for _, sector, side, _, entry in hits:
+        view.setdefault(sector, {'gainers': [], 'losers': []})[side].append(entry)
+    return view
+
+def get_watchlist_view(snapshot, watchlist, version):
+    """build_watchlist_view memoized by (snapshot generation, watchlist version) in a bounded LRU"""
+    key = (snapshot['generation'], version)
+    with watchlist_views['lock']:
+        view = watchlist_views['entries'].get(key)
+        if view is not None:
+            watchlist_views['entries'].move_to_end(key)
+            watchlist_views['hits'] += 1
+            return view
+        watchlist_views['misses'] += 1
+
+    view = build_watchlist_view(snapshot['symbol_index'], watchlist.symbols())
+    with watchlist_views['lock']:
+        watchlist_views['entries'][key] = view
+        while len(watchlist_views['entries']) > WATCHLIST_VIEW_CACHE_SIZE:
+            watchlist_views['entries'].popitem(last=False)
+    return view
+
+DELTA_ARTICLE_FIELDS = ('title', 'url', 'summary', 'source', 'stock_mentions', 'sentiment_label', 'published_date')
+
+def compute_snapshot_delta(old_sector_data, new_sector_data):
+    """
+    Per-sector changes between two build_gainers_losers() results:
+    re-ranked gainers/losers (symbol + count only) and articles not shown before
+    """
+    changes = {}
+    
+    for sector, data in new_sector_data.items():
+        old = old_sector_data.get(sector, {})
+        sector_changes = {}
+        
+        for key, count_key in (('gainers', 'positive_count'), ('losers', 'negative_count')):
+            ranked = [{'symbol': s['symbol'], count_key: s[count_key]} for s in data[key]]
+            old_ranked = [{'symbol': s['symbol'], count_key: s[count_key]} for s in old.get(key, [])]
+            if ranked != old_ranked:
+                sector_changes[key] = ranked
+        
+        for key in ('positive', 'negative'):
+            old_urls = {art['url'] for art in old.get(key, [])}
+            new_items = [
+                {field: art.get(field) for field in DELTA_ARTICLE_FIELDS}
+                for art in data[key] if art['url'] not in old_urls
+            ]
+            if new_items:
+                sector_changes[key] = new_items
+        
+        if sector_changes:
+            changes[sector] = sector_changes
+    
+    removed_sectors = [sector for sector in old_sector_data if sector not in new_sector_data]
+    return changes, removed_sectors
+
+ARTICLE_FIELDS = ('title', 'description', 'url', 'sentiment', 'sentiment_label', 'source',
+                  'stock_mentions', 'summary', 'published_date')
+
+def build_dashboard_payload(sector_data, generation, sectors=None, fields=None):
+    """
+    Normalized dashboard JSON: every article stored once in an id-keyed table,
+    gainers/losers/positive/negative reference articles by id
+    """
+    fields = fields or ARTICLE_FIELDS
+    articles = {}
+    
+    def ref(art):
+        aid = art.get('id') or article_id(art['url'])
+        if aid not in articles:
+            articles[aid] = {field: art.get(field) for field in fields}
+        return aid
+    
+    payload_sectors = {}
+    for sector, data in sector_data.items():
+        if sectors and sector not in sectors:
+            continue
+        payload_sectors[sector] = {
+            'gainers': [
+                {'symbol': g['symbol'], 'positive_count': g['positive_count'],
+                 'articles': [ref(a) for a in g['articles']]}
+                for g in data['gainers']
+            ],
+            'losers': [
+                {'symbol': l['symbol'], 'negative_count': l['negative_count'],
+                 'articles': [ref(a) for a in l['articles']]}
+                for l in data['losers']
+            ],
+            'positive': [ref(a) for a in data['positive']],
+            'negative': [ref(a) for a in data['negative']]
+        }
+    
+    return {
+        'generation': generation,
+        'sectors': payload_sectors,
+        'articles': articles
+    }
@@ -0,0 +1,153 @@
+"""
+Async Server-Sent Events server for the dashboards
+
+Waitress gives every request a worker thread, and an SSE stream is a request
+that never ends, so /api/stream on the WSGI app only takes a few clients. This
+serves the same stream from one asyncio event loop on its own port
+($STOCK_NEWS_SSE_PORT, default 5001, "off" to disable): an open dashboard costs
+a socket and a bounded queue instead of a thread, so thousands can subscribe.
+The loop is attached to the shared EventBroadcaster as one listener and fans
+each pre-formatted frame out to its clients.
+
+Dashboards connect to the page's host on this port (responses allow
+cross-origin reads). Behind a reverse proxy or TLS, route /api/stream to this
+port and set $STOCK_NEWS_SSE_URL to the public stream URL.
+"""
+import asyncio
+import os
+import threading
+from urllib.parse import urlsplit
+
+from .events import SSE_QUEUE_SIZE
+from .logs import add_log, event_broadcaster, WARNING
+from .metrics import Gauge
+
+SSE_PORT_ENV = 'STOCK_NEWS_SSE_PORT'
+SSE_URL_ENV = 'STOCK_NEWS_SSE_URL'
+DEFAULT_SSE_PORT = 5001
+SSE_MAX_CLIENTS = 5000      # one socket + queue each
+SSE_HEARTBEAT = 15          # seconds between keep-alive comments
+HEADER_TIMEOUT = 10         # seconds a client gets to send its request
+STREAM_PATH = '/api/stream'
+
+# clients is only touched on the loop thread
+sse_server = {'started': False, 'port': None, 'clients': set(), 'dropped': 0, 'lock': threading.Lock()}
+
+Gauge('stocknews_sse_async_clients', 'Dashboards streaming from the async SSE server',
+      lambda: len(sse_server['clients']))
+
+
+class LoopRelay:
+    """The broadcaster's single listener for the loop: hands each frame to the loop thread"""
+
+    def __init__(self, loop):
+        self.loop = loop
+
+    def put(self, frame):
+        try:
+            self.loop.call_soon_threadsafe(fan_out, frame)
+        except RuntimeError:
+            pass    # loop closed at interpreter exit
+
+
+def fan_out(frame):
+    """Queue frame for every client, dropping a slow client's oldest frame when it is full"""
+    for client in sse_server['clients']:
+        if client.full():
+            client.get_nowait()
+            sse_server['dropped'] += 1
+        client.put_nowait(frame)
+
+
+def response_head(status, headers):
+    lines = [f"HTTP/1.1 {status}"] + [f"{name}: {value}" for name, value in headers.items()]
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+
+async def handle(reader, writer):
+    """One HTTP connection: GET /api/stream becomes an event stream, anything else is refused"""
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), HEADER_TIMEOUT)
+    except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+        writer.close()
+        return
+
+    request_line, *header_lines = head.decode('latin-1').split('\r\n')
+    method, target = (request_line.split(' ') + ['', ''])[:2]
+    headers = {}
+    for line in header_lines:
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    common = {'Access-Control-Allow-Origin': '*', 'Cache-Control': 'no-cache'}
+    if method != 'GET' or urlsplit(target).path != STREAM_PATH:
+        writer.write(response_head('404 Not Found', {**common, 'Content-Length': '0', 'Connection': 'close'}))
+        await writer.drain()
+        writer.close()
+        return
+    if len(sse_server['clients']) >= SSE_MAX_CLIENTS:
+        writer.write(response_head('503 Service Unavailable',
+                                   {**common, 'Retry-After': '30', 'Content-Length': '0', 'Connection': 'close'}))
+        await writer.drain()
+        writer.close()
+        return
+
+    client = asyncio.Queue(SSE_QUEUE_SIZE)
+    for frame in event_broadcaster.replay(headers.get('last-event-id')):
+        client.put_nowait(frame)
+    sse_server['clients'].add(client)
+    try:
+        writer.write(response_head('200 OK', {**common, 'Content-Type': 'text/event-stream; charset=utf-8',
+                                              'Connection': 'keep-alive', 'X-Accel-Buffering': 'no'}))
+        writer.write(b"retry: 5000\n\n")
+        while True:
+            # A client that stops reading is cut off instead of holding its slot forever
+            await asyncio.wait_for(writer.drain(), SSE_HEARTBEAT * 2)
+            try:
+                frame = await asyncio.wait_for(client.get(), SSE_HEARTBEAT)
+            except asyncio.TimeoutError:
+                frame = ": heartbeat\n\n"
+            writer.write(frame.encode('utf-8'))
+    except (asyncio.TimeoutError, ConnectionError, OSError):
+        pass
+    finally:
+        sse_server['clients'].discard(client)
+        writer.close()
+
+
+def start_sse_server():
+    """Start the loop thread once per process; the port, or None when disabled or the port is taken"""
+    with sse_server['lock']:
+        if sse_server['started']:
+            return sse_server['port']
+        sse_server['started'] = True
+
+        setting = os.environ.get(SSE_PORT_ENV) or str(DEFAULT_SSE_PORT)
+        if setting == 'off':
+            return None
+        loop = asyncio.new_event_loop()
+        try:
+            server = loop.run_until_complete(asyncio.start_server(handle, '0.0.0.0', int(setting), backlog=1024))
+        except (OSError, ValueError) as e:
+            loop.close()
+            add_log(f"⚠️ Async SSE server not started on port {setting}: {e}; dashboards use the capped /api/stream",
+                    WARNING, stage='http')
+            return None
+
+        sse_server['port'] = server.sockets[0].getsockname()[1]
+        threading.Thread(target=loop.run_forever, name='sse-server', daemon=True).start()
+        event_broadcaster.attach(LoopRelay(loop))
+        add_log(f"📡 Async SSE server on port {sse_server['port']}", stage='http')
+        return sse_server['port']
+
+
+def stream_url(host):
+    """Where a dashboard served from host opens its EventSource, or None without the async server"""
+    if os.environ.get(SSE_URL_ENV):
+        return os.environ[SSE_URL_ENV]
+    if sse_server['port'] is None:
+        return None
+    hostname = urlsplit('//' + host).hostname or 'localhost'
+    if ':' in hostname:
+        hostname = f"[{hostname}]"
+    return f"//{hostname}:{sse_server['port']}{STREAM_PATH}"
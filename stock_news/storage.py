@@ -0,0 +1,20 @@
+"""
+JSON files under user_data/
+"""
+import os
+
+from . import json_provider
+
+def ensure_data_dirs():
+    os.makedirs('user_data', exist_ok=True)
+    os.makedirs('user_data/watchlists', exist_ok=True)
+    os.makedirs('user_data/users', exist_ok=True)
+
+def read_json_file(path):
+    with open(path, 'rb') as f:
+        return json_provider.loads(f.read())
+
+def write_json_file(path, data):
+    # Compact (non-indented) output: smaller files, faster writes
+    with open(path, 'wb') as f:
+        f.write(json_provider.dumps_bytes(data))
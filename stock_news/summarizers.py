@@ -0,0 +1,115 @@
+"""
+Summarizer backends for /summarize, selected by the active profile
+
+'extractive' scores sentences on position, financial keywords and figures;
+'transformers' runs a seq2seq model (loaded on first use) and falls back to
+'extractive' when the model is unavailable; 'lead' takes the first sentences.
+"""
+import re
+import threading
+
+from .logs import add_log, WARNING, ERROR
+
+def smart_extractive_summary(text, max_sentences=3):
+    """
+    Intelligent extractive summarization - FAST for production
+    """
+    try:
+        sentences = []
+        for sent in text.split('.'):
+            sent = sent.strip()
+            if len(sent.split()) > 5:
+                sentences.append(sent)
+        
+        if not sentences:
+            return text[:300] + '...'
+        
+        sentence_scores = []
+        
+        financial_keywords = [
+            'profit', 'revenue', 'growth', 'earnings', 'sales', 'margin',
+            'stock', 'shares', 'market', 'investor', 'quarter', 'fy',
+            'crore', 'lakh', 'billion', 'million', 'percent', '%',
+            'announced', 'reported', 'increased', 'decreased', 'rose', 'fell',
+            'gain', 'loss', 'performance', 'results', 'outlook'
+        ]
+        
+        for idx, sent in enumerate(sentences):
+            score = 0
+            sent_lower = sent.lower()
+            
+            if idx == 0:
+                score += 10
+            elif idx == 1:
+                score += 5
+            
+            keyword_count = sum(1 for kw in financial_keywords if kw in sent_lower)
+            score += keyword_count * 3
+            
+            if re.search(r'\d+', sent):
+                score += 5
+            
+            if re.search(r'\b[A-Z]{2,}\b', sent):
+                score += 3
+            
+            word_count = len(sent.split())
+            if 10 <= word_count <= 30:
+                score += 2
+            
+            sentence_scores.append((score, idx, sent))
+        
+        sentence_scores.sort(reverse=True)
+        top_sentences = sentence_scores[:max_sentences]
+        top_sentences.sort(key=lambda x: x[1])
+        
+        summary = '. '.join([sent[2] for sent in top_sentences]) + '.'
+        return summary
+        
+    except Exception as e:
+        print(f"Summarization error: {e}")
+        sentences = [s.strip() for s in text.split('.') if len(s.split()) > 5]
+        return '. '.join(sentences[:3]) + '.' if sentences else text[:300] + '...'
+
+def lead_summary(text, max_sentences=3):
+    """First sentences of the article"""
+    sentences = text.split('. ')
+    return '. '.join(sentences[:max_sentences]) + '.'
+
+MODEL_NAME = 't5-base'
+MODEL_MAX_WORDS = 800  # stay under the model's 1024-token input limit
+
+model = {'pipeline': None, 'failed': False, 'lock': threading.Lock()}
+
+def get_model_pipeline():
+    """transformers summarization pipeline, loaded once; None if unavailable"""
+    with model['lock']:
+        if model['pipeline'] is None and not model['failed']:
+            try:
+                from transformers import pipeline
+                model['pipeline'] = pipeline("summarization", model=MODEL_NAME, device=-1)
+                add_log(f"✅ Summarization model loaded ({MODEL_NAME})", stage='summarize')
+            except Exception as e:
+                model['failed'] = True
+                add_log(f"⚠️ Summarization model not loaded: {e}", WARNING, stage='summarize')
+        return model['pipeline']
+
+def model_summary(text, max_sentences=3):
+    summarizer = get_model_pipeline()
+    if summarizer is not None:
+        try:
+            words = text.split()
+            if len(words) > MODEL_MAX_WORDS:
+                text = ' '.join(words[:MODEL_MAX_WORDS])
+            
+            summary_output = summarizer(text, max_length=130, min_length=30, do_sample=False)
+            return summary_output[0]['summary_text']
+        except Exception as e:
+            add_log(f"❌ Summarizer error: {e}", ERROR, stage='summarize')
+    
+    return smart_extractive_summary(text, max_sentences)
+
+SUMMARIZERS = {
+    'extractive': smart_extractive_summary,
+    'transformers': model_summary,
+    'lead': lead_summary,
+}
@@ -0,0 +1,148 @@
+"""
+User accounts (user_data/users.db)
+
+One SQLite table keyed by username: a login is a single index lookup and each
+registration is its own transaction, so concurrent sign-ups can't overwrite
+each other. Accounts from the old user_data/users.json are imported once.
+"""
+import os
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+from .admission import Overloaded
+from .logs import add_log
+from .passwords import hash_password, check_password, needs_rehash
+from .storage import read_json_file
+from .watchlists import create_empty_watchlist
+
+USERS_DB = 'user_data/users.db'
+LEGACY_USERS_FILE = 'user_data/users.json'
+DB_TIMEOUT = 10     # seconds a writer waits for another process's transaction
+ADMINS_ENV = 'STOCK_NEWS_ADMINS'   # comma-separated usernames allowed on /admin pages
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username   TEXT PRIMARY KEY,
+    id         TEXT NOT NULL UNIQUE,
+    password   TEXT NOT NULL,
+    email      TEXT,
+    created_at TEXT
+);
+CREATE TABLE IF NOT EXISTS alert_rules (
+    user_id TEXT PRIMARY KEY,
+    rule    TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# sqlite3 connections belong to the thread that opened them: one per thread
+user_store = {'local': threading.local(), 'ready': False, 'lock': threading.Lock()}
+
+def get_connection():
+    """This thread's connection; creates the schema and migrates users.json on first use"""
+    local = user_store['local']
+    conn = getattr(local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(USERS_DB, timeout=DB_TIMEOUT, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')     # readers don't block the writer
+        conn.execute('PRAGMA synchronous=NORMAL')
+        local.conn = conn
+
+    if not user_store['ready']:
+        with user_store['lock']:
+            if not user_store['ready']:
+                conn.executescript(SCHEMA)
+                migrate_users_json(conn)
+                user_store['ready'] = True
+    return conn
+
+@contextmanager
+def transaction(conn):
+    """BEGIN IMMEDIATE ... COMMIT (ROLLBACK on error); takes the write lock up front"""
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        yield conn
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    conn.execute('COMMIT')
+
+def migrate_users_json(conn):
+    """One-shot import of user_data/users.json (left in place; a meta row marks it done)"""
+    with transaction(conn):
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'users_json_migrated'").fetchone():
+            return
+        try:
+            users = read_json_file(LEGACY_USERS_FILE)
+        except FileNotFoundError:
+            users = {}
+        conn.executemany(
+            'INSERT OR IGNORE INTO users (username, id, password, email, created_at) VALUES (?, ?, ?, ?, ?)',
+            [(username, user['id'], user['password'], user.get('email'), user.get('created_at'))
+             for username, user in users.items()])
+        conn.execute("INSERT INTO meta (key, value) VALUES ('users_json_migrated', ?)",
+                     (datetime.now().isoformat(),))
+    if users:
+        add_log(f"📦 Migrated {len(users)} users from users.json", stage='users')
+
+def get_user(username):
+    row = get_connection().execute(
+        'SELECT id, password, email, created_at FROM users WHERE username = ?', (username,)).fetchone()
+    return dict(row) if row else None
+
+def get_email(user_id):
+    row = get_connection().execute('SELECT email FROM users WHERE id = ?', (user_id,)).fetchone()
+    return row['email'] if row else None
+
+def update_password_hash(username, old_hash, new_hash):
+    """Swap in new_hash unless the password changed meanwhile"""
+    with transaction(get_connection()) as conn:
+        conn.execute('UPDATE users SET password = ? WHERE username = ? AND password = ?',
+                     (new_hash, username, old_hash))
+
+def create_user(username, password, email):
+    if get_user(username) is not None:
+        return False, "Username already exists"   # skip hashing; the insert below still catches races
+    
+    user_id = str(uuid.uuid4())
+    password_hash = hash_password(password)
+    try:
+        with transaction(get_connection()) as conn:
+            conn.execute('INSERT INTO users (username, id, password, email, created_at) VALUES (?, ?, ?, ?, ?)',
+                         (username, user_id, password_hash, email, datetime.now().isoformat()))
+    except sqlite3.IntegrityError:
+        return False, "Username already exists"
+
+    create_empty_watchlist(user_id)
+    return True, "User created successfully"
+
+def verify_user(username, password):
+    user = get_user(username)
+    if user is None:
+        return False, "User not found"
+
+    if not check_password(user['password'], password):
+        return False, "Invalid password"
+
+    # Hash made with older cost parameters: upgrade it now that we know the password
+    if needs_rehash(user['password']):
+        try:
+            new_hash = hash_password(password)
+        except Overloaded:
+            return True, user   # the password checked out; upgrade on a later login
+        update_password_hash(username, user['password'], new_hash)
+        user['password'] = new_hash
+        add_log(f"🔐 Rehashed password for {username}", stage='auth')
+    return True, user
+
+def is_admin(username):
+    """True when username is listed in $STOCK_NEWS_ADMINS (nobody is by default)"""
+    admins = {name.strip() for name in os.environ.get(ADMINS_ENV, '').split(',') if name.strip()}
+    return bool(username) and username in admins
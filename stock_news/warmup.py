@@ -0,0 +1,67 @@
+"""
+Per-worker warmup, run before the worker takes traffic
+"""
+import threading
+import time
+from datetime import datetime
+
+from . import alerts, http_client, passwords, prices, sse_server, users
+from .analysis import get_symbol_matchers
+from .logs import add_log, ERROR
+from .search import get_search_index
+from .snapshot import load_or_fetch_snapshot, ensure_news_refresher
+from .watchlists import build_watcher_index
+
+app_state = {
+    'ready': False,
+    'warmup': None,
+    'lock': threading.Lock()
+}
+
+def compile_templates(app):
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
+
+def warmup(app):
+    """Prepare this worker before it takes traffic; /readyz reports 200 once done"""
+    with app_state['lock']:
+        if app_state['ready']:
+            return
+        
+        add_log("🔥 Warming up...", stage='warmup')
+        started = time.perf_counter()
+        steps = {}
+        error = None
+        
+        try:
+            for name, step in (('matchers', get_symbol_matchers),
+                               ('templates', lambda: compile_templates(app)),
+                               ('http_client', http_client.get_client),
+                               ('users', users.get_connection),    # schema + one-shot users.json migration
+                               ('password_pool', passwords.get_pool),
+                               ('watchlists', build_watcher_index),
+                               ('search_index', get_search_index),
+                               ('alert_rules', alerts.load_rules),
+                               ('alert_sink', alerts.engine.get_sink),
+                               ('quote_cache', prices.get_quote_cache),
+                               ('snapshot', load_or_fetch_snapshot),
+                               ('sse_server', sse_server.start_sse_server)):
+                step_started = time.perf_counter()
+                step()
+                steps[name] = round(time.perf_counter() - step_started, 3)
+            
+            # Keep the snapshot fresh in the background so requests never wait on a fetch
+            ensure_news_refresher()
+            app_state['ready'] = True
+        except Exception as e:
+            error = str(e)
+            add_log(f"❌ Warmup failed: {error}", ERROR, stage='warmup')
+        
+        app_state['warmup'] = {
+            'steps': steps,
+            'seconds': round(time.perf_counter() - started, 3),
+            'error': error,
+            'finished_at': datetime.now().isoformat()
+        }
+        if app_state['ready']:
+            add_log(f"✅ Warmup complete in {app_state['warmup']['seconds']}s", stage='warmup')
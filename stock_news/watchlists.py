@@ -0,0 +1,326 @@
+"""
+Per-user watchlists (user_data/watchlists/<user_id>_watchlist.json)
+
+In memory a watchlist is a Watchlist, its stocks keyed by symbol; on disk it
+keeps the original {'user_id', ..., 'stocks': [...]} layout.
+
+Watchlists are served from memory: a file is read once, the first time its
+user is seen. Edits go through edit_watchlist(), which holds that user's lock
+for the read-modify-write, installs the edited copy with a new version and
+queues the user for the background flusher. The flusher writes every queued
+watchlist once per FLUSH_INTERVAL (temp file + rename), so a crash loses at
+most that much and never leaves a half-written file. This assumes a single
+server process owns user_data/watchlists.
+
+An inverted index (symbol -> user ids) is kept in step with every load and
+edit, and rebuilt at warmup, so fan-out from new articles to the users
+watching their stocks costs time per match rather than per user.
+"""
+import atexit
+import csv
+import io
+import itertools
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+from .companies import VALID_INDIAN_SYMBOLS, SYMBOL_TO_NAME, SYMBOL_TO_SECTOR
+from .logs import add_log, DEBUG, ERROR
+from .metrics import Gauge
+from .storage import read_json_file, write_json_file
+
+WATCHLIST_DIR = 'user_data/watchlists'
+FLUSH_INTERVAL = 2.0    # seconds between write-behind passes
+MAX_BULK_SYMBOLS = 500  # symbols accepted by one bulk change or import
+
+# Broker holdings exports name the symbol column differently; first match wins
+SYMBOL_COLUMNS = ('symbol', 'tradingsymbol', 'trading symbol', 'instrument', 'stock symbol',
+                  'scrip', 'scrip name', 'ticker', 'stock', 'security')
+EXCHANGE_PREFIXES = ('NSE:', 'BSE:')
+SERIES_SUFFIXES = ('-EQ', '-BE', '.NS', '.BO')
+
+watchlist_cache = {
+    'entries': {},          # user_id -> {'data', 'version', 'lock'}
+    'dirty': set(),         # user_ids waiting for the flusher
+    'versions': itertools.count(1),
+    'flusher': None,
+    'lock': threading.Lock()
+}
+
+Gauge('stocknews_watchlists_cached', 'Watchlists held in memory', lambda: len(watchlist_cache['entries']))
+Gauge('stocknews_watchlists_dirty', 'Watchlists waiting to be written', lambda: len(watchlist_cache['dirty']))
+
+# symbol -> ids of users watching it
+watcher_index = {
+    'symbols': defaultdict(set),
+    'lock': threading.Lock()
+}
+
+Gauge('stocknews_watched_symbols', 'Symbols on at least one watchlist', lambda: len(watcher_index['symbols']))
+
+class Watchlist:
+    """A user's stocks keyed by symbol (in the order added), plus the file's other fields"""
+
+    def __init__(self, data):
+        self.meta = {key: value for key, value in data.items() if key != 'stocks'}
+        self.stocks = {stock['symbol']: stock for stock in data.get('stocks', [])}
+
+    def __contains__(self, symbol):
+        return symbol in self.stocks
+
+    def __len__(self):
+        return len(self.stocks)
+
+    def __iter__(self):
+        return iter(self.stocks.values())
+
+    def symbols(self):
+        return self.stocks.keys()
+
+    def add(self, symbol, name='', sector=''):
+        """Add a stock; False if the symbol is already there"""
+        if symbol in self.stocks:
+            return False
+        self.stocks[symbol] = {
+            'symbol': symbol,
+            'name': name,
+            'sector': sector,
+            'added_at': datetime.now().isoformat()
+        }
+        return True
+
+    def remove(self, symbol):
+        """Remove a stock; False if the symbol wasn't there"""
+        return self.stocks.pop(symbol, None) is not None
+
+    def copy(self):
+        clone = Watchlist({})
+        clone.meta = dict(self.meta)
+        clone.stocks = dict(self.stocks)
+        return clone
+
+    def to_dict(self):
+        return dict(self.meta, stocks=list(self.stocks.values()))
+
+def watchlist_path(user_id):
+    return f'{WATCHLIST_DIR}/{user_id}_watchlist.json'
+
+def new_watchlist(user_id):
+    return {
+        'user_id': user_id,
+        'created_at': datetime.now().isoformat(),
+        'updated_at': datetime.now().isoformat(),
+        'stocks': []
+    }
+
+def get_entry(user_id):
+    """Cache entry for a user, reading the file on first access only"""
+    entry = watchlist_cache['entries'].get(user_id)
+    if entry is None:
+        with watchlist_cache['lock']:
+            entry = watchlist_cache['entries'].setdefault(
+                user_id, {'data': None, 'version': 0, 'lock': threading.Lock()})
+
+    if entry['data'] is None:
+        with entry['lock']:
+            if entry['data'] is None:
+                try:
+                    data = read_json_file(watchlist_path(user_id))
+                except FileNotFoundError:
+                    data = new_watchlist(user_id)
+                    mark_dirty(user_id)
+                entry['version'] = next(watchlist_cache['versions'])
+                entry['data'] = Watchlist(data)
+                index_watchlist(user_id, frozenset(), entry['data'].symbols())
+    return entry
+
+def create_empty_watchlist(user_id):
+    """Start a new user's watchlist (written by the next flush)"""
+    get_entry(user_id)
+
+def load_user_watchlist(user_id):
+    """Current Watchlist from memory; treat it as read-only (edits go through edit_watchlist)"""
+    return get_entry(user_id)['data']
+
+def get_watchlist_version(user_id):
+    """Version of the in-memory watchlist; changes on every edit (ETag input)"""
+    return get_entry(user_id)['version']
+
+@contextmanager
+def edit_watchlist(user_id):
+    """
+    Read-modify-write under the user's lock:
+
+        with edit_watchlist(user_id) as watchlist:
+            watchlist.add(symbol, name, sector)
+
+    The yielded copy replaces the cached watchlist on exit if it changed, so
+    any number of changes in one block cost one version bump and one write;
+    readers keep seeing the previous version until then.
+    """
+    entry = get_entry(user_id)
+    with entry['lock']:
+        current = entry['data']
+        watchlist = current.copy()
+        yield watchlist
+        if list(watchlist.stocks) != list(current.stocks):
+            watchlist.meta['updated_at'] = datetime.now().isoformat()
+            entry['data'] = watchlist
+            entry['version'] = next(watchlist_cache['versions'])
+            index_watchlist(user_id, current.symbols(), watchlist.symbols())
+            mark_dirty(user_id)
+
+def mark_dirty(user_id):
+    with watchlist_cache['lock']:
+        watchlist_cache['dirty'].add(user_id)
+    ensure_flusher()
+
+def flush_watchlists():
+    """Write every queued watchlist (atomically, one file per user); returns how many"""
+    with watchlist_cache['lock']:
+        dirty, watchlist_cache['dirty'] = watchlist_cache['dirty'], set()
+
+    written = 0
+    for user_id in dirty:
+        path = watchlist_path(user_id)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            write_json_file(tmp_path, watchlist_cache['entries'][user_id]['data'].to_dict())
+            os.replace(tmp_path, path)
+            written += 1
+        except Exception as e:
+            add_log(f"❌ Could not save watchlist {user_id}: {e}", ERROR, stage='watchlist')
+            with watchlist_cache['lock']:
+                watchlist_cache['dirty'].add(user_id)   # retry on the next pass
+    if written:
+        add_log(f"💾 Saved {written} watchlists", DEBUG, stage='watchlist')
+    return written
+
+def flush_loop():
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        flush_watchlists()
+
+def ensure_flusher():
+    if watchlist_cache['flusher'] is None:
+        with watchlist_cache['lock']:
+            if watchlist_cache['flusher'] is None:
+                thread = threading.Thread(target=flush_loop, name='watchlist-flusher', daemon=True)
+                thread.start()
+                watchlist_cache['flusher'] = thread
+
+# **REVERSE INDEX**
+def index_watchlist(user_id, old_symbols, new_symbols):
+    """Move user_id between symbols' watcher sets (only the symbols that changed)"""
+    removed = old_symbols - new_symbols
+    added = new_symbols - old_symbols
+    if not removed and not added:
+        return
+    with watcher_index['lock']:
+        symbols = watcher_index['symbols']
+        for symbol in removed:
+            watchers = symbols.get(symbol)
+            if watchers is not None:
+                watchers.discard(user_id)
+                if not watchers:
+                    del symbols[symbol]
+        for symbol in added:
+            symbols[symbol].add(user_id)
+
+def build_watcher_index():
+    """Load every watchlist on disk into the cache (and so into the index); returns how many"""
+    suffix = '_watchlist.json'
+    user_ids = [name[:-len(suffix)] for name in os.listdir(WATCHLIST_DIR) if name.endswith(suffix)]
+    for user_id in user_ids:
+        get_entry(user_id)
+    add_log(f"🗂️ Indexed {len(user_ids)} watchlists, {len(watcher_index['symbols'])} watched symbols",
+            stage='watchlist')
+    return len(user_ids)
+
+def watchers_of(symbol):
+    """Ids of users watching symbol (a copy)"""
+    with watcher_index['lock']:
+        return set(watcher_index['symbols'].get(symbol, ()))
+
+def match_articles(articles):
+    """
+    Fan a batch of annotated articles out to watching users:
+    {user_id: [{'article': article, 'symbols': [watched symbols it mentions]}, ...]}.
+    Work is proportional to the (article, symbol, watcher) matches, not to the user count.
+    """
+    matches = defaultdict(dict)     # user_id -> article url -> match
+    with watcher_index['lock']:
+        symbols = watcher_index['symbols']
+        for article in articles:
+            for symbol in article.get('stock_mentions', ()):
+                for user_id in symbols.get(symbol, ()):
+                    match = matches[user_id].get(article['url'])
+                    if match is None:
+                        match = matches[user_id][article['url']] = {'article': article, 'symbols': []}
+                    match['symbols'].append(symbol)
+    return {user_id: list(by_url.values()) for user_id, by_url in matches.items()}
+
+# **BULK CHANGES**
+def normalize_symbol(raw):
+    """'nse:tcs-eq ' -> 'TCS'"""
+    symbol = raw.strip().upper()
+    for prefix in EXCHANGE_PREFIXES:
+        if symbol.startswith(prefix):
+            symbol = symbol[len(prefix):]
+    for suffix in SERIES_SUFFIXES:
+        if symbol.endswith(suffix):
+            symbol = symbol[:-len(suffix)]
+    return symbol
+
+def parse_holdings_csv(text):
+    """Symbols from a holdings CSV: the first recognised symbol column, else the first column"""
+    rows = list(csv.reader(io.StringIO(text.lstrip('\ufeff'))))
+    rows = [row for row in rows if any(cell.strip() for cell in row)]
+    if not rows:
+        return []
+
+    header = [cell.strip().lower() for cell in rows[0]]
+    column = next((header.index(name) for name in SYMBOL_COLUMNS if name in header), None)
+    if column is None:
+        column, body = 0, rows     # no header row we recognise: assume bare symbols
+    else:
+        body = rows[1:]
+    return [row[column] for row in body if len(row) > column and row[column].strip()]
+
+def validate_symbols(raw_symbols):
+    """One pass: (valid symbols in first-seen order, unknown symbols, duplicates dropped)"""
+    valid, unknown, seen = [], [], set()
+    for raw in raw_symbols:
+        symbol = normalize_symbol(raw)
+        if not symbol or symbol in seen:
+            continue
+        seen.add(symbol)
+        (valid if symbol in VALID_INDIAN_SYMBOLS else unknown).append(symbol)
+    return valid, unknown
+
+def apply_bulk_changes(user_id, add=(), remove=()):
+    """
+    Validate and apply many additions/removals as one edit (one version, one
+    write). Returns a report of what changed and what was skipped.
+    """
+    to_add, unknown_add = validate_symbols(add)
+    to_remove, unknown_remove = validate_symbols(remove)
+
+    report = {'added': [], 'removed': [], 'already_present': [], 'not_in_watchlist': [],
+              'unknown': unknown_add + [s for s in unknown_remove if s not in unknown_add]}
+    with edit_watchlist(user_id) as watchlist:
+        for symbol in to_remove:
+            (report['removed'] if watchlist.remove(symbol) else report['not_in_watchlist']).append(symbol)
+        for symbol in to_add:
+            if watchlist.add(symbol, SYMBOL_TO_NAME.get(symbol, ''), SYMBOL_TO_SECTOR.get(symbol, '')):
+                report['added'].append(symbol)
+            else:
+                report['already_present'].append(symbol)
+        report['total_stocks'] = len(watchlist)
+    return report
+
+# Don't lose the last FLUSH_INTERVAL of edits on a clean shutdown
+atexit.register(flush_watchlists)
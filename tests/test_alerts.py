@@ -0,0 +1,110 @@
+"""
+AlertEngine: dedup, per-user rate limit, quiet hours and sector filters
+"""
+import os
+import sys
+from collections import defaultdict
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from stock_news import alerts, watchlists  # noqa: E402
+from stock_news.alerts import AlertEngine, MemorySink, RATE_BURST, compile_rule, validate_rule  # noqa: E402
+
+NOON = datetime(2026, 1, 5, 12, 0).timestamp()
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """An engine over a memory sink, with empty watcher index and rules"""
+    monkeypatch.setitem(watchlists.watcher_index, 'symbols', defaultdict(set))
+    monkeypatch.setitem(alerts.alert_rules, 'rules', {})
+    return AlertEngine(sink=MemorySink())
+
+
+def watch(user_id, *symbols):
+    watchlists.index_watchlist(user_id, set(), set(symbols))
+
+def set_rule(user_id, **fields):
+    rule, error = validate_rule(fields)
+    assert error is None
+    alerts.alert_rules['rules'][user_id] = compile_rule(rule)
+
+def article(n, *symbols, label='Positive', sentiment=0.8):
+    return {'url': f'https://example.com/{n}', 'title': f'Article {n}', 'source': 'Test',
+            'stock_mentions': list(symbols), 'sentiment_label': label, 'sentiment': sentiment,
+            'published_date': '2026-01-05 09:30'}
+
+
+def test_an_article_alerts_each_user_once(engine):
+    watch('a', 'TCS')
+    watch('b', 'TCS')
+
+    first = engine.evaluate([article(1, 'TCS')], now=NOON)
+    again = engine.evaluate([article(1, 'TCS')], now=NOON + 60)
+
+    assert sorted(alert['user_id'] for alert in first) == ['a', 'b']
+    assert again == []
+    assert engine.outcomes['duplicate'] == 2
+
+
+def test_rate_limit_is_per_user(engine):
+    watch('a', 'TCS')
+    watch('b', 'INFY')
+
+    batch = [article(n, 'TCS') for n in range(RATE_BURST + 2)] + [article('infy', 'INFY')]
+    delivered = engine.evaluate(batch, now=NOON)
+
+    assert sum(alert['user_id'] == 'a' for alert in delivered) == RATE_BURST
+    assert [alert['url'] for alert in delivered if alert['user_id'] == 'b'] == ['https://example.com/infy']
+    assert engine.outcomes['rate_limited'] == 2
+
+
+@pytest.mark.parametrize('hour, minute, quiet', [
+    (22, 0, True), (23, 30, True), (2, 0, True), (6, 59, True),
+    (7, 0, False), (12, 0, False), (21, 59, False),
+])
+def test_quiet_hours_span_midnight(engine, hour, minute, quiet):
+    watch('a', 'TCS')
+    set_rule('a', quiet_hours=['22:00', '07:00'])
+
+    now = datetime(2026, 1, 5, hour, minute).timestamp()
+    delivered = engine.evaluate([article(1, 'TCS')], now=now)
+
+    assert (delivered == []) is quiet
+    assert engine.outcomes['quiet_hours'] == (1 if quiet else 0)
+
+
+def test_sector_filter_keeps_only_matching_symbols(engine):
+    watch('a', 'TCS', 'HDFCBANK')
+    set_rule('a', sectors=['IT'])
+
+    delivered = engine.evaluate([article(1, 'TCS', 'HDFCBANK'), article(2, 'HDFCBANK')], now=NOON)
+
+    assert [(alert['url'], alert['symbols'], alert['sector']) for alert in delivered] == [
+        ('https://example.com/1', ['TCS'], 'IT')]
+    assert engine.outcomes['filtered'] == 1
+
+
+def test_rule_labels_and_confidence_filter(engine):
+    watch('a', 'TCS')
+    set_rule('a', labels=['Negative'], min_confidence=0.75)
+
+    delivered = engine.evaluate([article(1, 'TCS', label='Positive'),
+                                 article(2, 'TCS', label='Negative', sentiment=0.7),
+                                 article(3, 'TCS', label='Negative', sentiment=0.8)], now=NOON)
+
+    assert [alert['url'] for alert in delivered] == ['https://example.com/3']
+
+
+def test_deliver_sends_in_batches(engine, monkeypatch):
+    monkeypatch.setattr(alerts, 'BATCH_SIZE', 2)
+    watch('a', 'TCS')
+
+    sent = engine.deliver(engine.evaluate([article(n, 'TCS') for n in range(5)], now=NOON))
+
+    assert sent == 5
+    assert engine.sink.batches == 3
+    assert len(engine.sink.alerts) == 5
@@ -0,0 +1,134 @@
+"""
+QuoteCache: coalesced provider calls, background window refresh, stale quotes
+"""
+import os
+import sys
+import threading
+import time
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from stock_news import prices  # noqa: E402
+from stock_news.prices import QuoteCache, STALE_TTL, make_quote  # noqa: E402
+
+TTL = 10
+
+
+class FakeProvider:
+    """Counts calls and records their symbols; calls block while `gate` is clear, fail while `fail` is set"""
+    name = 'fake'
+
+    def __init__(self):
+        self.calls = []
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+        self.gate.set()
+        self.fail = False
+        self.lock = threading.Lock()
+
+    def get_quotes(self, symbols):
+        with self.lock:
+            self.calls.append(list(symbols))
+            price = 100.0 + len(self.calls)
+        self.entered.set()
+        self.gate.wait(5)
+        if self.fail:
+            raise Exception('provider down')
+        return {symbol: make_quote(symbol, price, 1.0, 'test') for symbol in symbols}
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+def make_cache(monkeypatch, start=1000.0):
+    clock = Clock(start)
+    monkeypatch.setattr(prices, 'time', types.SimpleNamespace(time=clock.time, perf_counter=time.perf_counter))
+    provider = FakeProvider()
+    return QuoteCache(provider, ttl=TTL), provider, clock
+
+
+def wait_idle(cache, timeout=5):
+    deadline = time.monotonic() + timeout
+    while cache.stats()['fetching'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not cache.stats()['fetching']
+
+
+def test_concurrent_requests_share_one_provider_call(monkeypatch):
+    cache, provider, _ = make_cache(monkeypatch)
+    provider.gate.clear()
+    results = []
+
+    def lookup():
+        results.append(cache.get_quotes(['TCS', 'INFY']))
+
+    first = threading.Thread(target=lookup)
+    first.start()
+    assert provider.entered.wait(5)
+    others = [threading.Thread(target=lookup) for _ in range(7)]
+    for thread in others:
+        thread.start()
+    provider.gate.set()
+    for thread in [first] + others:
+        thread.join(5)
+
+    assert provider.calls == [['TCS', 'INFY']]
+    assert len(results) == 8
+    assert all(result == results[0] for result in results)
+    assert results[0]['TCS']['price'] == 101.0
+
+
+def test_expired_window_served_at_once_and_refreshed_in_background(monkeypatch):
+    cache, provider, clock = make_cache(monkeypatch)
+    cache.get_quotes(['TCS'])
+
+    clock.now += TTL            # next window: the cached quote has expired
+    provider.gate.clear()       # the refresh can't finish until we say so
+    started = time.monotonic()
+    quotes = cache.get_quotes(['TCS'])
+    assert time.monotonic() - started < 1
+    assert quotes['TCS']['price'] == 101.0
+    assert 'stale' not in quotes['TCS']
+
+    assert provider.entered.wait(5)
+    provider.gate.set()
+    wait_idle(cache)
+    assert provider.calls == [['TCS'], ['TCS']]
+    assert cache.get_quotes(['TCS'])['TCS']['price'] == 102.0
+    assert len(provider.calls) == 2
+
+
+def test_only_the_requesters_missing_symbols_are_fetched_inline(monkeypatch):
+    cache, provider, clock = make_cache(monkeypatch)
+    cache.get_quotes(['TCS', 'WIPRO'])     # recently used, by someone else
+
+    clock.now += TTL
+    quotes = cache.get_quotes(['TCS', 'INFY'])
+    wait_idle(cache)
+
+    assert quotes['INFY']['status'] == 'test'
+    assert provider.calls[0] == ['TCS', 'WIPRO']
+    assert sorted(map(sorted, provider.calls[1:])) == [['INFY'], ['TCS', 'WIPRO']]
+
+
+def test_failing_provider_serves_stale_then_unavailable(monkeypatch):
+    cache, provider, clock = make_cache(monkeypatch)
+    cache.get_quotes(['TCS'])
+    provider.fail = True
+
+    clock.now += 2 * TTL        # a whole window without a successful refresh
+    quotes = cache.get_quotes(['TCS'])
+    wait_idle(cache)
+    assert quotes['TCS']['price'] == 101.0
+    assert quotes['TCS']['stale'] is True
+
+    clock.now += STALE_TTL      # too old to stand in any longer
+    quotes = cache.get_quotes(['TCS'])
+    assert quotes['TCS']['status'] == 'unavailable'
+    assert quotes['TCS']['price'] is None
@@ -0,0 +1,28 @@
+"""
+Startup budget: building the app (`app.create()`) must stay within
+benchmarks/startup_budget.py's time and RSS budgets without loading the heavy
+modules eagerly.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+import startup_budget  # noqa: E402
+
+
+def test_probe_reports_through_prefixed_line():
+    measurement, _ = startup_budget.run_child()
+    assert set(measurement) == {'import_ms', 'rss_mb', 'loaded'}
+    assert measurement['import_ms'] > 0 and measurement['rss_mb'] > 0
+
+
+def test_app_import_within_budget():
+    failures = startup_budget.over_budget(startup_budget.measure())
+    assert not failures, '; '.join(failures)
+
+
+def test_over_budget_flags_each_regression():
+    measurement = {'import_ms': startup_budget.IMPORT_BUDGET_MS + 1,
+                   'rss_mb': startup_budget.RSS_BUDGET_MB + 1, 'loaded': ['torch']}
+    assert len(startup_budget.over_budget(measurement)) == 3